@@ -0,0 +1,435 @@
+"""Render benchmark
+
+Run the clock with each effect on the simulator and report, per tick and
+per frame, the render time and the number of drawing calls.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json
+
+The `--baseline` option compares the run with a previous JSON result.
+
+    python benchmark.py --soak 24 --effect RainbowCharEffect
+
+The `--soak` option runs a screen (clock, calendar and brightness) for
+hours of virtual time, across a day change, and reports the render cost
+and the memory growth.
+
+    python benchmark.py --alloc
+
+The `--alloc` option audits the memory allocated per steady-state tick by
+the clock, it fails if the low memory draw path (`format_time` and
+`draw_buffer`) allocates. `update_time` is reported but not checked, its
+coroutines allocate.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+import simulator
+
+simulator.install()
+
+import uasyncio  # noqa: E402
+from galactic import GalacticUnicorn  # noqa: E402
+from picographics import DISPLAY_GALACTIC_UNICORN, PicoGraphics  # noqa: E402
+
+from unicornclock import Brightness, Clock, Position, Screen  # noqa: E402
+from unicornclock import effects, pipeline, transitions  # noqa: E402
+from unicornclock.widgets import Calendar  # noqa: E402
+
+
+class SlideDownPipeline:
+    transition = pipeline.SlideDownTransition
+
+
+class EasedSlidePipeline:
+    transition = transitions.EasedSlideTransition
+
+
+class WipePipeline:
+    transition = transitions.WipeTransition
+
+
+class FadePipeline:
+    transition = transitions.FadeTransition
+
+
+class DissolvePipeline:
+    transition = transitions.DissolveTransition
+
+
+class RainbowPipeline:
+    colorizer = pipeline.RainbowColorizer
+
+
+class RainbowColumnPipeline:
+    colorizer = pipeline.RainbowColumnColorizer
+
+
+EFFECTS = (
+    None,
+    effects.CharacterSlideDownEffect,
+    effects.CharacterSlideUpEffect,
+    effects.CharacterFadeEffect,
+    effects.RainbowCharEffect,
+    effects.RainbowPixelEffect,
+    effects.RainbowMoveEffect,
+    SlideDownPipeline,
+    EasedSlidePipeline,
+    WipePipeline,
+    FadePipeline,
+    DissolvePipeline,
+    RainbowPipeline,
+    RainbowColumnPipeline,
+)
+
+COUNTED_METHODS = (
+    'clear',
+    'create_pen',
+    'pixel',
+    'rectangle',
+    'set_pen',
+)
+
+
+def counted(name):
+    method = getattr(PicoGraphics, name)
+
+    def wrapper(self, *args):
+        self.counters[name] += 1
+        return method(self, *args)
+
+    return wrapper
+
+
+class CountingGraphics(PicoGraphics):
+    """PicoGraphics counting the calls of the drawing methods"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counters = dict.fromkeys(COUNTED_METHODS, 0)
+
+    clear = counted('clear')
+    create_pen = counted('create_pen')
+    pixel = counted('pixel')
+    rectangle = counted('rectangle')
+    set_pen = counted('set_pen')
+
+
+class CountingGalacticUnicorn(GalacticUnicorn):
+
+    updates = 0
+
+    def update(self, graphics):
+        self.updates += 1
+        super().update(graphics)
+
+
+async def no_sleep(*args, **kwargs):
+    pass
+
+
+def iter_times(ticks, hour=12, minute=59, second=0):
+    for _ in range(ticks):
+        yield hour, minute, second
+        second += 1
+        if second == 60:
+            second = 0
+            minute += 1
+            if minute == 60:
+                minute = 0
+                hour = (hour + 1) % 24
+
+
+async def bench(effect, show_seconds, ticks):
+    galactic = CountingGalacticUnicorn()
+    galactic.recorder.max_frames = 1
+    graphics = CountingGraphics(DISPLAY_GALACTIC_UNICORN)
+
+    bases = (effect, Clock) if effect else (Clock,)
+    cls = type('BenchClock', bases, {})
+    clock = cls(
+        galactic,
+        graphics,
+        x=Position.CENTER,
+        show_seconds=show_seconds,
+    )
+
+    # Only the render cost is measured
+    sleeps = uasyncio.sleep, uasyncio.sleep_ms
+    uasyncio.sleep = uasyncio.sleep_ms = no_sleep
+
+    graphics.counters = dict.fromkeys(COUNTED_METHODS, 0)
+    galactic.updates = 0
+    elapsed = 0
+    try:
+        for hour, minute, second in iter_times(ticks):
+            start = time.perf_counter_ns()
+            await clock.update_time(clock.format_time(hour, minute, second))
+            if clock.callback_time_updated:
+                await clock.callback_time_updated(hour, minute, second)
+            elapsed += time.perf_counter_ns() - start
+    finally:
+        uasyncio.sleep, uasyncio.sleep_ms = sleeps
+
+    frames = max(galactic.updates, 1)
+    result = {
+        'effect': effect.__name__ if effect else 'Clock',
+        'show_seconds': show_seconds,
+        'ticks': ticks,
+        'frames': galactic.updates,
+        'tick_time_us': elapsed / ticks / 1000,
+        'frame_time_us': elapsed / frames / 1000,
+        'galactic_update': galactic.updates / ticks,
+    }
+    for name, count in graphics.counters.items():
+        result[name] = count / ticks
+
+    return result
+
+
+async def soak(effect, hours):
+    galactic = CountingGalacticUnicorn()
+    galactic.recorder.max_frames = 1
+    graphics = CountingGraphics(DISPLAY_GALACTIC_UNICORN)
+
+    bases = (effect, Clock) if effect else (Clock,)
+    cls = type('SoakClock', bases, {})
+
+    screen = Screen(galactic, graphics)
+    clock = screen.add(
+        cls(galactic, graphics, show_seconds=True),
+        Position.RIGHT,
+    )
+    screen.add(Calendar(galactic, graphics), Position.LEFT)
+    screen.add(Brightness(galactic))
+
+    events = dict.fromkeys(('hour', 'day'), 0)
+
+    def counter(name):
+        def callback(*args):
+            events[name] += 1
+        return callback
+
+    for name in events:
+        clock.events.subscribe(name, counter(name))
+
+    asyncio.create_task(screen.run())
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    # The first half warms up the caches (and the interpreter free lists),
+    # the memory growth is measured over the second half
+    await asyncio.sleep(hours * 3600 / 2)
+    memory, _ = tracemalloc.get_traced_memory()
+    await asyncio.sleep(hours * 3600 / 2)
+
+    elapsed = time.perf_counter() - start
+    growth = tracemalloc.get_traced_memory()[0] - memory
+    tracemalloc.stop()
+
+    print('%s: %i hours in %.1f s, %i frames, %i hour and %i day events, '
+          'memory growth %i bytes (second half)' % (
+              effect.__name__ if effect else 'Clock',
+              hours,
+              elapsed,
+              galactic.updates,
+              events['hour'],
+              events['day'],
+              growth,
+          ))
+
+
+class NullGalacticUnicorn:
+
+    def update(self, graphics):
+        pass
+
+
+class NullGraphics:
+    """Graphics doing nothing, only the allocations of the clock count"""
+
+    bounds = (53, 11)
+
+    def get_bounds(self):
+        return self.bounds
+
+    def create_pen(self, r, g, b):
+        return (r << 16) | (g << 8) | b
+
+    def set_pen(self, pen):
+        pass
+
+    def set_clip(self, x, y, w, h):
+        pass
+
+    def remove_clip(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def pixel(self, x, y):
+        pass
+
+    def rectangle(self, x, y, w, h):
+        pass
+
+
+def run_sync(coroutine):
+    """Run a coroutine which never sleeps"""
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+    raise Exception('The coroutine is sleeping.')
+
+
+def audit(low_memory, ticks, warmup=120):
+    """Measure the memory allocated per tick
+
+    Returns the mean and max of the bytes allocated (peak) while drawing
+    a tick with `draw`, and with `update_time` (coroutine included).
+    """
+    clock = Clock(
+        NullGalacticUnicorn(),
+        NullGraphics(),
+        show_seconds=True,
+        low_memory=low_memory,
+    )
+
+    def draw(hour, minute, second):
+        text = clock.format_time(hour, minute, second)
+        if low_memory:
+            clock.draw_buffer(text)
+            clock.last_time = text
+        else:
+            for index, offset, size, _, char in clock.iter_on_changes(text):
+                clock.callback_write_char(char, index)
+                clock.write_char(char, clock.x + offset, clock.y)
+            clock.last_time = text
+
+    def update(hour, minute, second):
+        run_sync(clock.update_time(clock.format_time(hour, minute, second)))
+
+    def nothing(hour, minute, second):
+        pass
+
+    result = {}
+    times = list(iter_times(warmup + ticks))
+    for name, func in (
+            ('nothing', nothing), ('draw', draw), ('update_time', update)):
+        clock.full_update()
+        for hms in times[:warmup]:
+            func(*hms)
+
+        tracemalloc.start()
+        allocated = []
+        for hms in times[warmup:]:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            func(*hms)
+            allocated.append(tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+
+        result[name] = (sum(allocated) / ticks, max(allocated))
+
+    # Remove the cost of the measure itself
+    overhead = result.pop('nothing')[1]
+    for name, (mean, max_) in result.items():
+        result[name] = (mean - overhead, max_ - overhead)
+
+    return result
+
+
+def key(result):
+    return '%s%s' % (
+        result['effect'],
+        ' (seconds)' if result['show_seconds'] else '',
+    )
+
+
+def print_results(results, baseline=None):
+    baseline = {key(r): r for r in baseline} if baseline else {}
+
+    columns = ('tick_time_us', 'frame_time_us', 'galactic_update') + \
+        COUNTED_METHODS
+    print('%-36s' % 'per tick' + ''.join(
+        '%16s' % name for name in columns
+    ))
+    for result in results:
+        line = '%-36s' % key(result)
+        reference = baseline.get(key(result))
+        for name in columns:
+            value = '%.1f' % result[name]
+            if reference and reference[name]:
+                value += ' %+.0f%%' % (
+                    (result[name] - reference[name]) * 100 / reference[name]
+                )
+            line += '%16s' % value
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--ticks', type=int, default=120,
+                        help='Number of clock ticks per combination')
+    parser.add_argument('--output', help='Save the results in a JSON file')
+    parser.add_argument('--baseline',
+                        help='Compare with the results of a JSON file')
+    parser.add_argument('--soak', type=int, metavar='HOURS',
+                        help='Run a screen for hours of virtual time')
+    parser.add_argument('--effect', help='Effect of the soak test')
+    parser.add_argument('--alloc', action='store_true',
+                        help='Audit the allocations per tick')
+    args = parser.parse_args()
+
+    if args.alloc:
+        failed = False
+        for low_memory in (False, True):
+            result = audit(low_memory, args.ticks)
+            print('%-12s %s' % (
+                'low memory' if low_memory else 'default',
+                ', '.join(
+                    '%s: %.1f bytes per tick (max %i)' % (name, mean, max_)
+                    for name, (mean, max_) in result.items()
+                ),
+            ))
+            if low_memory and result['draw'][1]:
+                failed = True
+
+        if failed:
+            print('The low memory draw path allocates.')
+            sys.exit(1)
+        return
+
+    if args.soak:
+        effect = getattr(effects, args.effect) if args.effect else None
+        simulator.run(soak(effect, args.soak), start=(2024, 1, 1, 23, 0, 0))
+        return
+
+    results = []
+    for effect in EFFECTS:
+        for show_seconds in (False, True):
+            results.append(
+                asyncio.run(bench(effect, show_seconds, args.ticks)),
+            )
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'ticks': args.ticks, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,13 +7,15 @@ from galactic import GalacticUnicorn
 from machine import Pin
 from picographics import DISPLAY_GALACTIC_UNICORN, PicoGraphics
 
-from unicornclock import Brightness, Clock, Position
+from unicornclock import Brightness, Clock, Compositor, Position
 from unicornclock.effects import (
+    CharacterFadeEffect,
     CharacterSlideDownEffect,
     RainbowCharEffect,
     RainbowPixelEffect,
     RainbowMoveEffect,
 )
+from unicornclock.switcher import EffectSwitcher
 from unicornclock.utils import debounce, set_time
 from unicornclock.widgets import Calendar
 
@@ -31,6 +33,9 @@ machine.freq(200000000)
 galactic = GalacticUnicorn()
 graphics = PicoGraphics(DISPLAY_GALACTIC_UNICORN)
 
+# the widgets update the display at most once per frame through it
+compositor = Compositor(galactic, graphics)
+
 BLACK = graphics.create_pen(0, 0, 0)
 BLUE = graphics.create_pen(0, 0, 255)
 GREEN = graphics.create_pen(0, 255, 0)
@@ -133,41 +138,34 @@ class RainbowMoveEffectClock(RainbowMoveEffect, NoSpaceClock):
     pass
 
 
+class FadeClock(CharacterFadeEffect, SimpleClock):
+    pass
+
+
 effects = [
     SimpleClock,
     RainbowCharEffectClock,
     RainbowPixelEffectClock,
     RainbowMoveEffectClock,
+    FadeClock,
 ]
 
-clock = None
+# the running clock is stopped before the next effect starts
+switcher = EffectSwitcher(
+    galactic,
+    graphics,
+    effects,
+    background_color=BLACK,
+    # the calendar may have moved
+    clear_screen=True,
+    x=Position.RIGHT,
+    show_seconds=True,
+    am_pm_mode=False,
+    compositor=compositor,
+)
 
 async def load_example(effect_index, **kwargs):
-    global clock
-
-    if clock:
-        clock.is_running = False
-
-    graphics.remove_clip()
-    graphics.set_pen(BLACK)
-    graphics.clear()
-
-    default_kwargs = {
-        'x': Position.RIGHT,
-        'show_seconds': True,
-        'am_pm_mode': False,
-    }
-
-    if kwargs:
-        default_kwargs.update(kwargs)
-
-    clock = effects[effect_index](
-        galactic,
-        graphics,
-        **default_kwargs,
-    )
-
-    asyncio.create_task(clock.run())
+    await switcher.load(effect_index, **kwargs)
 
 mode = 0
 effect = 0
@@ -283,11 +281,17 @@ async def example():
 
     wlan_connection()
 
-    calendar = Calendar(galactic, graphics)
+    calendar = Calendar(galactic, graphics, compositor=compositor)
 
     def update_calendar(*args):
-        calendar.draw_all()
-
+        # The screen may have been cleared by the clock
+        calendar.full_update()
+        if calendar.draw_all():
+            calendar.update_display(
+                calendar.x, calendar.y, calendar.width, calendar.height,
+            )
+
+    asyncio.create_task(compositor.run())
     asyncio.create_task(brightness.run())
     asyncio.create_task(buttons_handler(brightness, calendar, update_calendar))
 
@@ -0,0 +1,85 @@
+"""Host-side simulator
+
+Pure CPython stand-ins for the MicroPython modules used by `unicornclock`
+(`galactic`, `picographics`, `machine`, `uasyncio`, `micropython` and
+`ntptime`).
+
+Call `install()` before importing `unicornclock`:
+
+    import simulator
+    simulator.install()
+
+    from galactic import GalacticUnicorn
+    from picographics import DISPLAY_GALACTIC_UNICORN, PicoGraphics
+
+`run` runs a coroutine on virtual time: the RTC, `ticks_*` and the sleeps
+follow a virtual clock which jumps to the next scheduled task, hours of
+clock render in seconds.
+"""
+import builtins
+import sys
+import time
+import traceback
+
+from . import (
+    galactic,
+    machine,
+    micropython,
+    ntptime,
+    picographics,
+    timing,
+    uasyncio,
+)
+from .galactic import GalacticUnicorn
+from .machine import RTC
+from .picographics import DISPLAY_GALACTIC_UNICORN, PicoGraphics
+from .recorder import FrameRecorder
+from .timing import VirtualClock, run
+
+MODULES = {
+    'galactic': galactic,
+    'machine': machine,
+    'micropython': micropython,
+    'ntptime': ntptime,
+    'picographics': picographics,
+    'uasyncio': uasyncio,
+}
+
+TIME_FUNCTIONS = (
+    'sleep_ms',
+    'sleep_us',
+    'ticks_add',
+    'ticks_diff',
+    'ticks_ms',
+    'ticks_us',
+)
+
+
+def install():
+    """Install the stand-in modules
+
+    Register the simulated modules in `sys.modules`, expose `micropython`
+    as a builtin (as the MicroPython compiler does), add the `ticks_*`
+    functions to the `time` module and `print_exception` to `sys`.
+    """
+    sys.modules.update(MODULES)
+
+    builtins.micropython = micropython
+
+    if not hasattr(sys, 'print_exception'):
+        sys.print_exception = traceback.print_exception
+
+    for name in TIME_FUNCTIONS:
+        setattr(time, name, getattr(timing, name))
+
+
+__all__ = [
+    'DISPLAY_GALACTIC_UNICORN',
+    'FrameRecorder',
+    'GalacticUnicorn',
+    'PicoGraphics',
+    'RTC',
+    'VirtualClock',
+    'install',
+    'run',
+]
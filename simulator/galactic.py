@@ -0,0 +1,44 @@
+"""`galactic` module stand-in"""
+from .recorder import FrameRecorder
+
+
+class GalacticUnicorn:
+
+    WIDTH = 53
+    HEIGHT = 11
+
+    SWITCH_A = 0
+    SWITCH_B = 1
+    SWITCH_C = 3
+    SWITCH_D = 6
+    SWITCH_SLEEP = 27
+    SWITCH_VOLUME_UP = 7
+    SWITCH_VOLUME_DOWN = 8
+    SWITCH_BRIGHTNESS_UP = 21
+    SWITCH_BRIGHTNESS_DOWN = 26
+
+    def __init__(self, recorder=None):
+        self.recorder = FrameRecorder() if recorder is None else recorder
+        self.brightness = 0.5
+        self.light_level = 2048
+
+    def update(self, graphics):
+        self.recorder.record(graphics)
+
+    def clear(self):
+        pass
+
+    def light(self):
+        return self.light_level
+
+    def set_brightness(self, value):
+        self.brightness = max(0.0, min(1.0, value))
+
+    def get_brightness(self):
+        return self.brightness
+
+    def adjust_brightness(self, delta):
+        self.set_brightness(self.brightness + delta)
+
+    def is_pressed(self, button):
+        return False
@@ -0,0 +1,52 @@
+"""`machine` module stand-in"""
+import time
+
+from . import timing
+
+
+def freq(hz=None):
+    if hz is None:
+        return 125000000
+
+
+class Pin:
+
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1):
+        self.id = id
+        self.handler = None
+
+    def irq(self, handler=None, trigger=IRQ_FALLING):
+        self.handler = handler
+
+    def value(self, value=None):
+        return 1
+
+
+class RTC:
+    """Fake RTC
+
+    Follows the host local time (or the virtual time, see `timing.run`).
+    Like the hardware, every instance shares the same time: setting it
+    with `datetime()` moves all of them.
+    """
+
+    # Offset in seconds between the RTC and the host local time
+    offset = 0
+
+    def datetime(self, datetimetuple=None):
+        if datetimetuple is None:
+            y, mo, d, h, m, s, wd, _, _ = time.localtime(
+                timing.get_time() + RTC.offset
+            )
+            return (y, mo, d, wd, h, m, s, 0)
+
+        y, mo, d, _, h, m, s, _ = datetimetuple
+        RTC.offset = time.mktime((y, mo, d, h, m, s, 0, 0, -1)) - \
+            timing.get_time()
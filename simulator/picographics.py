@@ -0,0 +1,113 @@
+"""`picographics` module stand-in
+
+Only the RGB888 Galactic Unicorn display is simulated. A pen is the
+color packed as `0xRRGGBB`.
+"""
+from array import array
+
+DISPLAY_GALACTIC_UNICORN = 0
+
+PEN_RGB888 = 8
+
+# 3x5 font used by `text` and `measure_text`
+FONT = {
+    '0': (0x7, 0x5, 0x5, 0x5, 0x7),
+    '1': (0x2, 0x3, 0x2, 0x2, 0x7),
+    '2': (0x7, 0x4, 0x7, 0x1, 0x7),
+    '3': (0x7, 0x4, 0x6, 0x4, 0x7),
+    '4': (0x5, 0x5, 0x7, 0x4, 0x4),
+    '5': (0x7, 0x1, 0x7, 0x4, 0x7),
+    '6': (0x7, 0x1, 0x7, 0x5, 0x7),
+    '7': (0x7, 0x4, 0x4, 0x4, 0x4),
+    '8': (0x7, 0x5, 0x7, 0x5, 0x7),
+    '9': (0x7, 0x5, 0x7, 0x4, 0x7),
+    ':': (0x0, 0x2, 0x0, 0x2, 0x0),
+    '.': (0x0, 0x0, 0x0, 0x0, 0x2),
+    '-': (0x0, 0x0, 0x7, 0x0, 0x0),
+    ' ': (0x0, 0x0, 0x0, 0x0, 0x0),
+}
+FONT_WIDTH = 3
+FONT_SPACING = 1
+
+
+class PicoGraphics:
+
+    def __init__(self, display=DISPLAY_GALACTIC_UNICORN, pen_type=PEN_RGB888):
+        self.width, self.height = 53, 11
+        self.framebuffer = array('L', [0]) * (self.width * self.height)
+        self.pen = 0
+        self.remove_clip()
+
+    def get_bounds(self):
+        return self.width, self.height
+
+    def create_pen(self, r, g, b):
+        return ((r & 0xff) << 16) | ((g & 0xff) << 8) | (b & 0xff)
+
+    def set_pen(self, pen):
+        self.pen = pen
+
+    def set_font(self, font):
+        pass
+
+    def set_clip(self, x, y, w, h):
+        self.clip = (
+            max(0, x),
+            max(0, y),
+            min(self.width, x + w),
+            min(self.height, y + h),
+        )
+
+    def remove_clip(self):
+        self.clip = (0, 0, self.width, self.height)
+
+    def pixel(self, x, y):
+        x1, y1, x2, y2 = self.clip
+        if x1 <= x < x2 and y1 <= y < y2:
+            self.framebuffer[y * self.width + x] = self.pen
+
+    def pixel_span(self, x, y, length):
+        for i in range(length):
+            self.pixel(x + i, y)
+
+    def rectangle(self, x, y, w, h):
+        self._fill(x, y, w, h)
+
+    def _fill(self, x, y, w, h):
+        x1, y1, x2, y2 = self.clip
+        x1, y1 = max(x1, x), max(y1, y)
+        x2, y2 = min(x2, x + w), min(y2, y + h)
+        for py in range(y1, y2):
+            start = py * self.width
+            for px in range(x1, x2):
+                self.framebuffer[start + px] = self.pen
+
+    def clear(self):
+        x1, y1, x2, y2 = self.clip
+        self._fill(x1, y1, x2 - x1, y2 - y1)
+
+    def line(self, x1, y1, x2, y2):
+        # Like the firmware, the end point is not drawn
+        dx, dy = x2 - x1, y2 - y1
+        steps = max(abs(dx), abs(dy))
+        for i in range(steps):
+            self.pixel(x1 + round(dx * i / steps), y1 + round(dy * i / steps))
+
+    def measure_text(self, text, scale=2, spacing=1):
+        if not text:
+            return 0
+        return len(text) * (FONT_WIDTH + FONT_SPACING) * scale
+
+    def text(self, text, x, y, wordwrap=-1, scale=2, angle=0, spacing=1):
+        for char in text:
+            rows = FONT.get(char, FONT[' '])
+            for row, bits in enumerate(rows):
+                for bit in range(FONT_WIDTH):
+                    if bits & (1 << bit):
+                        self._fill(x + bit * scale, y + row * scale,
+                                   scale, scale)
+            x += (FONT_WIDTH + FONT_SPACING) * scale
+
+    def snapshot(self):
+        """Return a copy of the framebuffer"""
+        return array('L', self.framebuffer)
@@ -0,0 +1,40 @@
+from . import timing
+
+
+class FrameRecorder:
+    """Frame recorder
+
+    Keep a copy of every frame pushed to the display with its timestamp
+    (in microseconds, from `ticks_us`).
+    """
+
+    def __init__(self, max_frames=None):
+        self.max_frames = max_frames
+        self.frames = []
+
+    def record(self, graphics):
+        if self.max_frames is not None and \
+                len(self.frames) >= self.max_frames:
+            self.frames.pop(0)
+
+        self.frames.append((timing.ticks_us(), graphics.snapshot()))
+
+    def clear(self):
+        self.frames = []
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    @staticmethod
+    def to_text(frame, width, on='#', off='.'):
+        """Return the frame as text, one line per row
+
+        Useful for golden-frame comparisons.
+        """
+        return '\n'.join(
+            ''.join(on if pen else off for pen in frame[y:y + width])
+            for y in range(0, len(frame), width)
+        )
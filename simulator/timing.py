@@ -0,0 +1,124 @@
+"""MicroPython `time.ticks_*` functions
+
+The time comes from the host, or from a `VirtualClock` when one is
+active (see `run`).
+"""
+import asyncio
+import math
+import selectors
+import time
+
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+# Active virtual clock, None for the host time
+clock = None
+
+
+class VirtualClock:
+    """Virtual clock
+
+    The time only moves forward when the event loop has nothing to do
+    but wait, it then jumps to the next scheduled task.
+    """
+
+    def __init__(self, start=None):
+        # Wall time (seconds since the epoch) at the start
+        self.epoch = time.time() if start is None else time.mktime(
+            tuple(start[:6]) + (0, 0, -1)
+        )
+        self.elapsed_ns = 0
+
+    def monotonic_ns(self):
+        return self.elapsed_ns
+
+    def time(self):
+        return self.epoch + self.elapsed_ns / 1000000000
+
+    def advance(self, seconds):
+        self.elapsed_ns += math.ceil(seconds * 1000000000)
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """Selector advancing the virtual clock instead of waiting"""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        if timeout:
+            self.clock.advance(timeout)
+        return super().select(0)
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+
+    def __init__(self, clock):
+        super().__init__(VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self):
+        return self.clock.monotonic_ns() / 1000000000
+
+
+def run(main, start=None):
+    """Run the coroutine `main` on virtual time
+
+    `start` is the (year, month, day, hour, minute, second) of the RTC at
+    the start, the host time by default.
+    """
+    global clock
+
+    clock = VirtualClock(start)
+    loop = VirtualEventLoop(clock)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True),
+            )
+        loop.close()
+        clock = None
+
+
+def monotonic_ns():
+    return time.monotonic_ns() if clock is None else clock.monotonic_ns()
+
+
+def get_time():
+    """Wall time, in seconds since the epoch"""
+    return time.time() if clock is None else clock.time()
+
+
+def ticks_us():
+    return (monotonic_ns() // 1000) & TICKS_MAX
+
+
+def ticks_ms():
+    return (monotonic_ns() // 1000000) & TICKS_MAX
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(ticks1, ticks2):
+    diff = (ticks1 - ticks2) & TICKS_MAX
+    return ((diff + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+
+def sleep_ms(ms):
+    if clock is None:
+        time.sleep(ms / 1000)
+    else:
+        clock.advance(ms / 1000)
+
+
+def sleep_us(us):
+    sleep_ms(us / 1000)
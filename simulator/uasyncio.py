@@ -0,0 +1,11 @@
+"""`uasyncio` module stand-in"""
+from asyncio import *  # noqa: F401, F403
+from asyncio import sleep, wait_for
+
+
+async def sleep_ms(ms):
+    await sleep(ms / 1000)
+
+
+async def wait_for_ms(awaitable, timeout):
+    return await wait_for(awaitable, timeout / 1000)
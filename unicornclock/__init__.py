@@ -1,3 +1,5 @@
 from .brightness import Brightness
 from .clock import Clock
 from .common import Clip, Position
+from .compositor import Compositor
+from .screen import Screen
@@ -1,7 +1,7 @@
 import uasyncio as asyncio
+from array import array
+from time import ticks_add, ticks_diff, ticks_ms
 
-# Todo:
-# - Change the brightness smoothly
 
 def mapval(value, in_min, in_max, out_min, out_max):
     return (
@@ -14,22 +14,62 @@ class Brightness:
     MODE_AUTO = 0
     MODE_MANUAL = 1
 
+    # The brightness is handled as an integer between 0 and BRIGHTNESS_MAX
+    BRIGHTNESS_MAX = 255
+
+    # Maximum value of the light sensor
+    LIGHT_MAX = 4095
+
     mode = MODE_AUTO
     level = 50
     offset = 0
 
+    # Ambient light, filtered with an exponential moving average
+    light = None
+    # Weight of a new sample is 1 / light_smoothing
+    light_smoothing = 4
+    # A light variation above this value is considered as a change
+    light_threshold = 40
+
+    # The light sensor is sampled every min_sample_interval ms while the
+    # light changes, the interval doubles up to max_sample_interval when
+    # it is stable
+    min_sample_interval = 200
+    max_sample_interval = 8000
+
+    # Brightness curve: gamma and clamps (between 0 and BRIGHTNESS_MAX)
+    gamma = 1.0
+    min_brightness = 0
+    max_brightness = BRIGHTNESS_MAX
+
+    # Brightness by ambient light, see `load_table`
+    table = None
+
+    # Brightness currently displayed
+    current = None
+    # 1 / easing of the remaining distance to the target is done at each
+    # step
+    easing = 5
+    # Delay in ms between two easing steps
+    easing_sleep = 50
+
     def __init__(
             self,
             galactic,
             level=50,
             mode=MODE_AUTO,
             offset=20,
+            gamma=None,
+            min_brightness=None,
+            max_brightness=None,
         ):
         self.galactic = galactic
         self.level = level
         self.mode = mode
         self.offset = offset
 
+        self.set_curve(gamma, min_brightness, max_brightness)
+
     def export(self):
         return {
             'mode': 'manual',
@@ -45,16 +85,96 @@ class Brightness:
     def get_corrected_level(self, level):
         return mapval(level, 0, 100, 0, 1)
 
+    def get_level_brightness(self, level):
+        """Get the brightness (between 0 and BRIGHTNESS_MAX) of a level"""
+        value = min(max(self.get_corrected_level(level), 0), 1) ** self.gamma
+        return min(
+            max(int(value * self.BRIGHTNESS_MAX + 0.5), self.min_brightness),
+            self.max_brightness,
+        )
+
+    def load_table(self):
+        """Build the ambient light to brightness lookup table
+
+        Needs to be called when the offset or the curve changes.
+        """
+        self.table = array('B', (
+            self.get_level_brightness(
+                mapval(light, 0, self.LIGHT_MAX, 1, 100) + self.offset
+            ) for light in range(self.LIGHT_MAX + 1)
+        ))
+
+    def set_curve(self, gamma=None, min_brightness=None, max_brightness=None):
+        """Set the brightness curve
+
+        `gamma` is applied to the level, the brightness is clamped between
+        `min_brightness` and `max_brightness` (from 0 to BRIGHTNESS_MAX).
+        """
+        if gamma is not None:
+            self.gamma = gamma
+        if min_brightness is not None:
+            self.min_brightness = min_brightness
+        if max_brightness is not None:
+            self.max_brightness = max_brightness
+
+        self.load_table()
+
+    def sample_light(self):
+        """Read the light sensor
+
+        Returns the variation of the light since the last samples.
+        """
+        value = self.galactic.light()
+        if self.light is None:
+            self.light = value
+            return 0
+
+        change = abs(value - self.light)
+        self.light += (value - self.light) // self.light_smoothing
+        return change
+
+    def get_light(self):
+        if self.light is None:
+            self.sample_light()
+        return self.light
+
     def get_auto_level(self):
-        return mapval(self.galactic.light(), 0, 4095, 1, 100)
+        return mapval(self.get_light(), 0, 4095, 1, 100)
+
+    def get_target(self):
+        if self.mode == self.MODE_MANUAL:
+            return self.get_level_brightness(self.level + self.offset)
+
+        return self.table[min(max(self.get_light(), 0), self.LIGHT_MAX)]
+
+    def set_brightness(self, value):
+        self.current = value
+        self.galactic.set_brightness(value / self.BRIGHTNESS_MAX)
 
     def update(self):
-        value = self.level if self.mode == self.MODE_MANUAL else \
-            self.get_auto_level()
+        """Set the brightness without easing"""
+        self.set_brightness(self.get_target())
 
-        self.galactic.set_brightness(
-            self.get_corrected_level(value + self.offset)
-        )
+    def ease(self):
+        """Move the brightness one step toward the target
+
+        Returns False when the target is reached.
+        """
+        target = self.get_target()
+        if self.current is None:
+            self.set_brightness(target)
+            return False
+
+        diff = target - self.current
+        if not diff:
+            return False
+
+        step = diff // self.easing
+        if not step:
+            step = 1 if diff > 0 else -1
+
+        self.set_brightness(self.current + step)
+        return True
 
     def set_mode(self, mode, offset=0):
         """Set the brightness mode
@@ -63,6 +183,8 @@ class Brightness:
         self.mode = mode
         self.offset = offset
 
+        self.load_table()
+
     def set_level(self, level):
         """Set the brightness level
         `level` need to be integer between 0 and 100
@@ -77,8 +199,43 @@ class Brightness:
             self.galactic.adjust_brightness(self.get_corrected_level(value))
         else:
             self.offset += value
+            self.load_table()
+
+    # Sampling interval and ticks_ms of the next sample
+    sample_interval = None
+    next_sample = None
+
+    # ticks_ms of the next easing step, None when the target is reached
+    next_step = None
+
+    def get_deadline(self):
+        """Get the ticks_ms at which `refresh` must be called"""
+        return self.next_step if self.next_step is not None else \
+            self.next_sample
+
+    async def refresh(self):
+        """Sample the light sensor if needed and ease the brightness"""
+        now = ticks_ms()
+        if self.next_sample is None or \
+                ticks_diff(now, self.next_sample) >= 0:
+            if self.mode == self.MODE_AUTO and \
+                    self.sample_light() >= self.light_threshold:
+                self.sample_interval = self.min_sample_interval
+            else:
+                self.sample_interval = min(
+                    (self.sample_interval or self.min_sample_interval) * 2,
+                    self.max_sample_interval,
+                )
+
+            self.next_sample = ticks_add(now, self.sample_interval)
+
+        self.next_step = ticks_add(now, self.easing_sleep) \
+            if self.ease() else None
 
     async def run(self):
         while True:
-            self.update()
-            await asyncio.sleep(1)
\ No newline at end of file
+            await self.refresh()
+
+            await asyncio.sleep_ms(
+                max(0, ticks_diff(self.get_deadline(), ticks_ms())),
+            )
@@ -1,14 +1,35 @@
 import uasyncio as asyncio
+from array import array
+from time import ticks_add, ticks_diff, ticks_ms
 
 from .common import Clip, ClockMixin, Position
+from .events import EventBus
 from .fonts import default as default_font
 from .fontdriver import FontDriver
+from .pipeline import Pipeline
 
 # Todo:
-# Add await on callback_hour_changed
 # Rename callback_hour_change to callback_hour_changed ?
 
 class Clock(ClockMixin, FontDriver):
+    """Clock
+
+    The changes of time are published on the `events` bus: `second`,
+    `minute`, `hour` and `day` events with the hour, minute and second as
+    arguments. The subscribers run in their own tasks, out of the render
+    path.
+
+    With `low_memory`, the time is written in place in a preallocated
+    bytearray and drawn from arrays: nothing is allocated to draw a tick
+    (`draw_buffer`), the coroutines and the time tuples of the tick still
+    allocate. The layout of the '00:00:00' template is used, the digits of
+    the font must have the same width. Only for the clocks drawing with
+    `Clock.update_time`, a ValueError is raised with an effect overriding
+    it, a pipeline or a `callback_set_pixel`.
+
+    With a `transition` or a `colorizer`, the time is drawn by a
+    `Pipeline` of stages instead of the effect mixins.
+    """
 
     show_seconds = False
     font_color = None
@@ -20,7 +41,29 @@ class Clock(ClockMixin, FontDriver):
 
     is_running = True
 
-    loop_sleep = 0.1
+    low_memory = False
+
+    # The digits have the same width, see `iter_on_changes`
+    fixed_width = False
+
+    # Stages of the render pipeline (classes or instances), see `Pipeline`
+    transition = None
+    colorizer = None
+    pipeline = None
+
+    # Milliseconds before the second change at which the next time is
+    # rendered, the display itself is updated on the second change
+    lookahead = 0
+
+    # Polling period (in milliseconds) of the RTC when looking for the
+    # second change
+    sync_sleep = 10
+
+    # ticks_ms of the last second change, None when unknown
+    second_ticks = None
+
+    # ticks_ms at which the next display update must be done
+    flip_ticks = None
 
     def __init__(
             self,
@@ -36,6 +79,10 @@ class Clock(ClockMixin, FontDriver):
             rtc=None,
             callback_hour_change=None,
             space_between_char=None,
+            compositor=None,
+            low_memory=None,
+            transition=None,
+            colorizer=None,
         ):
         super().__init__(galactic, graphics, font)
         self.requested_x, self.requested_y = x, y
@@ -43,13 +90,42 @@ class Clock(ClockMixin, FontDriver):
         self.am_pm_mode = am_pm_mode
         self.font_color = font_color
         self.background_color = background_color
-        self.callback_hour_change = callback_hour_change
+        if callback_hour_change is not None:
+            self.callback_hour_change = callback_hour_change
+        self.events = EventBus()
+
+        # From the arguments or overridden by a subclass
+        callback = self.callback_hour_change
+        if callback:
+            self.events.subscribe(
+                'hour',
+                lambda hour, minute, second: callback(hour),
+            )
+        self.compositor = compositor
+        if low_memory is not None:
+            self.low_memory = low_memory
         if space_between_char:
             self.space_between_char = space_between_char
 
+        if transition is not None:
+            self.transition = transition
+        if colorizer is not None:
+            self.colorizer = colorizer
+        if self.transition is not None or self.colorizer is not None:
+            self.pipeline = Pipeline(self, self.transition, self.colorizer)
+
+        if self.low_memory and (
+                self.pipeline or self.callback_set_pixel or
+                type(self).update_time is not Clock.update_time):
+            raise ValueError(
+                'The low memory mode only works with Clock.update_time '
+                '(no effect, no pipeline, no callback_set_pixel).'
+            )
+
         if rtc is None:
             import machine
-            self.rtc = machine.RTC()
+            rtc = machine.RTC()
+        self.rtc = rtc
 
         self.update_settings()
 
@@ -67,54 +143,230 @@ class Clock(ClockMixin, FontDriver):
         self.format_string = '{:02}:{:02}:{:02}' if self.show_seconds else \
             '{:02}:{:02}'
 
-        self.chars_bounds = [
-            x for x in self.get_chars_bounds(
-                self.format_string.format('0', '0', '0'),
-            )
-        ]
+        self.chars_bounds = list(self.get_chars_bounds(
+            self.format_string.format('0', '0', '0'),
+        ))
 
         _, total, width = self.chars_bounds[-1]
         self.width = total + width
+        self.fixed_width = self.is_fixed_width()
 
         self.screen_width, self.screen_height = self.graphics.get_bounds()
+        self.height = self.screen_height
 
         self.set_position(self.requested_x, self.requested_y)
 
+        if self.low_memory:
+            self.load_buffers()
+
+        if self.pipeline:
+            self.pipeline.setup()
+
         # Used mainly to initialize data in effect class
         if self.callback_after_init:
             self.callback_after_init()
 
+    def load_buffers(self):
+        """Prepare the buffers of the low memory mode"""
+        template = self.format_string.format(0, 0, 0)
+        self.time_buffer = bytearray(template.encode())
+
+        self.chars_offsets = array('B', [x[1] for x in self.chars_bounds])
+        self.chars_sizes = array('B', [x[2] for x in self.chars_bounds])
+
+        # The characters and their sprites (flatten runs), by code
+        self.chars_by_code = [None] * 128
+        self.sprites_by_code = [None] * 128
+        for char in self.font:
+            code = ord(char)
+            if code < 128:
+                self.chars_by_code[code] = char
+                self.sprites_by_code[code] = array('B', [
+                    value for run in self.get_sprite(char) for value in run
+                ])
+
+        self.last_buffer = bytearray(len(template))
+
+    def fill_time_buffer(self, hour, minute, second):
+        buffer = self.time_buffer
+        buffer[0] = 48 + hour // 10
+        buffer[1] = 48 + hour % 10
+        buffer[3] = 48 + minute // 10
+        buffer[4] = 48 + minute % 10
+        if self.show_seconds:
+            buffer[6] = 48 + second // 10
+            buffer[7] = 48 + second % 10
+        return buffer
+
     def format_time(self, hour, minute, second):
         if self.am_pm_mode:
             hour = hour % 12 if hour != 12 else hour
         else:
             hour = hour % 24
+
+        if self.low_memory:
+            return self.fill_time_buffer(hour, minute, second)
+
         return self.format_string.format(hour, minute, second)
 
+    def is_fixed_width(self):
+        """True when the digits have the same width and the space between
+        chars is constant: the layout of any time is the layout of the
+        template
+        """
+        if callable(self.space_between_char):
+            return False
+
+        widths = set()
+        for char in '0123456789':
+            start, end = self.chars_font_bounds[char]
+            widths.add(end - start)
+        return len(widths) == 1
+
     def callback_write_char(self, char, index):
         self.graphics.set_pen(self.font_color)
 
+    def is_moved(self, time):
+        """True when a character of time is not at its position in
+        last_time (the characters of a font can have different widths)
+        """
+        if self.fixed_width or self.last_time is None:
+            return False
+
+        layout = self.get_layout(time)
+        last_layout = self.get_layout(self.last_time)
+        if len(layout) != len(last_layout):
+            return True
+
+        for i in range(len(layout)):
+            if layout[i][1] != last_layout[i][1]:
+                return True
+        return False
+
     def iter_on_changes(self, time):
-        """Get information about the changes between last_time and time"""
-        for i, (last_char, char) in enumerate(
-            zip(self.last_time if self.last_time else time, time)
-        ):
-            if self.last_time is None or last_char != char:
-                yield (
-                    i,
-                    self.chars_bounds[i][1],
-                    self.chars_bounds[i][2],
-                    last_char,
-                    char,
-                )
+        """Get information about the changes between last_time and time
+
+        With digits of the same width, the characters keep the position of
+        the template and only the different ones change.
+
+        Otherwise, when a position moved, every character from the first
+        different one changes and its size covers the space up to the next
+        one. The size of the last character covers the end of the old
+        time: the boxes of the changes cover the old pixels.
+        """
+        last_time = self.last_time
+
+        if self.fixed_width:
+            for i, (_, offset, size) in enumerate(self.chars_bounds):
+                char = time[i]
+                if last_time is None:
+                    yield (i, offset, size, char, char)
+                elif last_time[i] != char:
+                    yield (i, offset, size, last_time[i], char)
+            return
+
+        layout = self.get_layout(time)
+        if last_time is None:
+            for i, (char, offset, size) in enumerate(layout):
+                yield (i, offset, size, char, char)
+            return
+
+        last_layout = self.get_layout(last_time)
+        _, last_offset, last_size = last_layout[-1]
+        last_end = last_offset + last_size
+
+        if not self.is_moved(time):
+            # Only the last character can be narrower than the old one
+            for i, (char, offset, size) in enumerate(layout):
+                last_char = last_layout[i][0]
+                if last_char != char:
+                    if i == len(layout) - 1:
+                        size = max(size, last_end - offset)
+                    yield (i, offset, size, last_char, char)
+            return
+
+        redraw = False
+        for i, (char, offset, size) in enumerate(layout):
+            if i < len(last_layout):
+                last_char, last_offset, _ = last_layout[i]
+            else:
+                last_char, last_offset = char, None
+
+            if not redraw and last_char == char and last_offset == offset:
+                continue
+
+            redraw = True
+            if i + 1 < len(layout):
+                end = layout[i + 1][1]
+            else:
+                end = max(offset + size, last_end)
+            yield (i, offset, end - offset, last_char, char)
 
     def write_time(self, time):
         self.graphics.set_pen(self.font_color)
         self.write_text(time, self.x, self.y)
-        self.galactic.update(self.graphics)
+        self.update_display(self.x, 0, self.width, self.screen_height)
+
+    # Region updated by `draw_buffer`
+    buffer_start = buffer_end = 0
+
+    def draw_buffer(self, buffer):
+        """Draw the changed characters of the time buffer
+
+        The low memory version of `update_time`: no allocation, the
+        updated region is saved in `buffer_start` and `buffer_end`.
+        """
+        graphics = self.graphics
+        last = self.last_buffer
+        offsets = self.chars_offsets
+        sizes = self.chars_sizes
+        full = self.last_time is None
+
+        self.buffer_start = self.buffer_end = 0
+        i = 0
+        while i < len(buffer):
+            code = buffer[i]
+            if full or code != last[i]:
+                x = self.x + offsets[i]
+                graphics.set_clip(x, 0, sizes[i], self.screen_height)
+                graphics.set_pen(self.background_color)
+                graphics.clear()
+
+                self.callback_write_char(self.chars_by_code[code], i)
+
+                sprite = self.sprites_by_code[code]
+                j = 0
+                while j < len(sprite):
+                    graphics.rectangle(x + sprite[j], self.y + sprite[j + 1],
+                                       sprite[j + 2], 1)
+                    j += 3
+
+                graphics.remove_clip()
+
+                if self.buffer_start == self.buffer_end:
+                    self.buffer_start = offsets[i]
+                self.buffer_end = offsets[i] + sizes[i]
+
+                last[i] = code
+            i += 1
 
     last_time = None
     async def update_time(self, time):
+        if self.low_memory:
+            self.draw_buffer(time)
+            if self.buffer_start != self.buffer_end:
+                await self.flip(
+                    self.x + self.buffer_start,
+                    self.buffer_end - self.buffer_start,
+                )
+            self.last_time = time
+            return
+
+        if self.pipeline:
+            await self.pipeline.update_time(time)
+            return
+
+        start = end = None
         for index, offset, size, _, character in self.iter_on_changes(time):
             with Clip(self.graphics, self.x + offset, 0, size,
                       self.screen_height):
@@ -124,10 +376,33 @@ class Clock(ClockMixin, FontDriver):
                 self.callback_write_char(character, index)
                 self.write_char(character, self.x + offset, self.y)
 
-        self.galactic.update(self.graphics)
+            if start is None:
+                start = offset
+            end = offset + size
+
+        # Nothing changed, nothing to display
+        if start is not None:
+            await self.flip(self.x + start, end - start)
 
         self.last_time = time
 
+    async def flip(self, x=None, width=None):
+        """Update the display
+
+        `x` and `width` are the updated region, the whole clock by default.
+        Wait for `flip_ticks` if the frame was rendered in advance.
+        """
+        if self.flip_ticks is not None:
+            delay = ticks_diff(self.flip_ticks, ticks_ms())
+            self.flip_ticks = None
+            if delay > 0:
+                await asyncio.sleep_ms(delay)
+
+        if x is None:
+            x, width = self.x, self.width
+
+        self.update_display(x, 0, width, self.screen_height)
+
     def full_update(self):
         self.last_time = None
 
@@ -135,35 +410,208 @@ class Clock(ClockMixin, FontDriver):
         _, _, _, _, hour, minute, second, _ = self.rtc.datetime()
         return hour, minute, second
 
+    @staticmethod
+    def get_next_time(hour, minute, second):
+        second += 1
+        if second == 60:
+            second = 0
+            minute += 1
+            if minute == 60:
+                minute = 0
+                hour = (hour + 1) % 24
+        return hour, minute, second
+
+    # ticks_ms of the next RTC read when polling, None to read it now
+    next_check = None
+
+    # ticks_ms of the RTC read checking the last flip, None if none
+    verify_ticks = None
+
+    def get_deadline(self):
+        """Get the ticks_ms of the next time check, None for now
+
+        Once the second change is located, this is just before the next
+        change. Otherwise, the RTC is polled every `sync_sleep`
+        milliseconds. After a flip, the RTC is read once more to check it.
+        """
+        if self.verify_ticks is not None:
+            return self.verify_ticks
+
+        if self.second_ticks is not None:
+            return ticks_add(
+                self.second_ticks,
+                1000 - max(self.lookahead, self.sync_sleep),
+            )
+
+        return self.next_check
+
+    def is_last_time(self, current):
+        return current[2] == self.last_second and \
+            current[1] == self.last_minute and current[0] == self.last_hour
+
+    def check_next_second(self):
+        """Check the time, returns the time to display or None
+
+        When the second change is located, the RTC is read only once to
+        check that it did not move. The time is rendered in advance and
+        the display update is delayed to the second change (see `flip`).
+
+        The RTC is read again `sync_sleep` milliseconds after the flip, it
+        must show the displayed time: otherwise (RTC set, ticks drift)
+        the time of the RTC is displayed and the second change is located
+        again.
+        """
+        current = self.get_time()
+
+        if self.verify_ticks is not None:
+            self.verify_ticks = None
+            if self.is_last_time(current):
+                return None
+
+            self.second_ticks = self.flip_ticks = None
+            self.next_check = ticks_add(ticks_ms(), self.sync_sleep)
+            return current
+
+        if self.second_ticks is not None:
+            if self.is_last_time(current):
+                change = ticks_add(self.second_ticks, 1000)
+                self.second_ticks = self.flip_ticks = change
+                self.verify_ticks = ticks_add(change, self.sync_sleep)
+                return self.get_next_time(*current)
+
+            # The second changed sooner than expected (late or RTC set)
+            self.second_ticks = None
+            return current
+
+        if self.last_second is None:
+            return current
+
+        if self.is_last_time(current):
+            self.next_check = ticks_add(ticks_ms(), self.sync_sleep)
+            return None
+
+        self.second_ticks = ticks_ms()
+        self.next_check = None
+        return current
+
+    async def wait_next_second(self):
+        """Wait for the next second and return its time"""
+        while True:
+            deadline = self.get_deadline()
+            if deadline is not None:
+                delay = ticks_diff(deadline, ticks_ms())
+                if delay > 0:
+                    await asyncio.sleep_ms(delay)
+
+            current = self.check_next_second()
+            if current is not None:
+                return current
+
+    async def refresh(self):
+        """Check the time and display it if needed (see `Screen`)
+
+        A dirty clock (e.g. moved) is redrawn right away with the time of
+        the RTC, not the next second rendered in advance.
+        """
+        if self.dirty:
+            self.dirty = False
+            self.full_update()
+
+            if self.last_second is not None:
+                self.flip_ticks = None
+                await self.update_time(self.format_time(*self.get_time()))
+                return
+
+        current = self.check_next_second()
+        if current is not None:
+            await self.tick(*current)
+
     last_second = None
+    last_minute = None
     last_hour = None
     async def need_update(self, hour, minute, second):
         return second != self.last_second
 
+    def publish_changes(self, hour, minute, second):
+        """Publish the events of the time changes
+
+        Everything changed at the first update.
+        """
+        if second == self.last_second and minute == self.last_minute and \
+                hour == self.last_hour:
+            return
+
+        events = self.events
+        events.publish('second', hour, minute, second)
+
+        if minute != self.last_minute or hour != self.last_hour:
+            events.publish('minute', hour, minute, second)
+
+        if hour != self.last_hour:
+            events.publish('hour', hour, minute, second)
+
+            if self.last_hour is None or hour < self.last_hour:
+                events.publish('day', hour, minute, second)
+
+    async def tick(self, hour, minute, second):
+        if not await self.need_update(hour, minute, second):
+            return
+
+        await self.update_time(self.format_time(
+            hour,
+            minute,
+            second,
+        ))
+
+        if self.callback_time_updated:
+            await self.callback_time_updated(hour, minute, second)
+
+        self.publish_changes(hour, minute, second)
+
+        self.last_second = second
+        self.last_minute = minute
+        self.last_hour = hour
+
     async def run(self):
-        while self.is_running:
-            hour, minute, second = self.get_time()
+        self.second_ticks = self.verify_ticks = None
+        try:
+            while self.is_running:
+                hour, minute, second = await self.wait_next_second()
 
-            if not await self.need_update(hour, minute, second):
-                asyncio.sleep(0.25)
-                continue
+                if not self.is_running:
+                    break
 
-            if hour != self.last_hour and self.callback_hour_change:
-                self.callback_hour_change(hour)
+                await self.tick(hour, minute, second)
+        finally:
+            self.events.close()
 
-            await self.update_time(self.format_time(
-                hour,
-                minute,
-                second,
-            ))
+    # Task of `run`, see `start` and `stop`
+    task = None
+
+    def start(self):
+        """Run the clock in its own task"""
+        if self.task is None:
+            self.is_running = True
+            self.task = asyncio.create_task(self.run())
+        return self.task
 
-            if self.callback_time_updated:
-                await self.callback_time_updated(hour, minute, second)
+    async def stop(self):
+        """Stop the clock, returns once its task is ended
 
-            self.last_second = second
-            self.last_hour = hour
+        The task is cancelled: the clock does not draw anymore, even in
+        the middle of an animation.
+        """
+        self.is_running = False
+
+        task, self.task = self.task, None
+        if task is None:
+            return
 
-            await asyncio.sleep(self.loop_sleep)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
     async def test(self):
         """Test method
@@ -173,19 +621,13 @@ class Clock(ClockMixin, FontDriver):
         """
         second = minute = hour = 0
         while True:
-            second += 1
-            if second == 60:
-                minute += 1
-                second = 0
-                if minute == 60:
-                    hour += 1
-                    minute = 0
+            hour, minute, second = self.get_next_time(hour, minute, second)
 
             time = '{:02}:{:02}:{:02}'.format(hour, minute, second)
             print(time)
-            asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
             await self.update_time(self.format_time(
                 hour,
                 minute,
                 second,
-            ))
\ No newline at end of file
+            ))
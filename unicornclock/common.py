@@ -1,3 +1,6 @@
+from time import ticks_add, ticks_diff, ticks_ms
+
+import uasyncio as asyncio
 
 
 class Clip:
@@ -16,6 +19,64 @@ class Clip:
         self.graphics.remove_clip()
 
 
+class Frames:
+    """Frames of an animation, scheduled on a deadline
+
+        async for frame in Frames(count, duration):
+            ...
+
+    Iterates on the frames from `first` to `count - 1`. The deadline of
+    each frame is counted from the end of the first one: the animation
+    always lasts `count * duration` milliseconds, the frames already
+    expired are skipped when the drawing is late. The event loop is never
+    blocked between frames.
+    """
+
+    def __init__(self, count, duration, first=0):
+        self.count = count
+        self.duration = duration
+        self.first = first
+        self.frame = None
+        self.start = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.frame is None:
+            self.frame = self.first
+            return self.frame
+
+        if self.start is None:
+            self.start = ticks_ms()
+
+        frame = self.frame + 1
+        if frame >= self.count:
+            raise StopAsyncIteration
+
+        delay = ticks_diff(
+            ticks_add(self.start, (frame - self.first) * self.duration),
+            ticks_ms(),
+        )
+
+        if delay < 0:
+            # Late, skip the frames already expired
+            if self.duration > 0:
+                frame = min(
+                    self.count - 1,
+                    self.first +
+                    ticks_diff(ticks_ms(), self.start) // self.duration,
+                )
+            else:
+                frame = self.count - 1
+            delay = 0
+
+        await asyncio.sleep_ms(delay)
+
+        self.frame = frame
+        return frame
+
+
 class Position:
     LEFT = '__left__'
     CENTER = '__center__'
@@ -27,6 +88,37 @@ class ClockMixin:
     x = 0 # Calculated x position
     y = 0 # Calculated y position
 
+    width = 0
+    height = 0
+
+    compositor = None
+
+    # Needs to be redrawn (e.g. moved), see `Screen`
+    dirty = False
+
+    def get_bounds(self):
+        return self.x, self.y, self.width, self.height
+
+    def get_deadline(self):
+        """Get the ticks_ms at which `refresh` must be called
+
+        None to call it as soon as possible.
+        """
+        return None
+
+    async def refresh(self):
+        self.dirty = False
+
+    def update_display(self, x, y, width, height):
+        """Update the display
+
+        Only mark the region as dirty when a compositor is used.
+        """
+        if self.compositor:
+            self.compositor.mark_dirty(x, y, width, height)
+        else:
+            self.galactic.update(self.graphics)
+
     def set_position(self, x, y=None):
         if x == Position.LEFT:
             self.x = 0
@@ -39,3 +131,5 @@ class ClockMixin:
 
         if y is not None:
             self.y = y
+
+        self.dirty = True
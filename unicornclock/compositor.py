@@ -0,0 +1,50 @@
+import uasyncio as asyncio
+
+
+class Compositor:
+    """Frame compositor
+
+    The widgets mark the regions they draw as dirty instead of updating
+    the display themselves. The display is updated at most once per frame
+    and only when a region is dirty.
+    """
+
+    # Minimal duration of a frame in milliseconds
+    frame_duration = 10
+
+    def __init__(self, galactic, graphics, frame_duration=None):
+        self.galactic = galactic
+        self.graphics = graphics
+        if frame_duration is not None:
+            self.frame_duration = frame_duration
+
+        # A region was drawn since the last display update
+        self.dirty = False
+        self.event = asyncio.Event()
+
+    def mark_dirty(self, x, y, width, height):
+        """Mark a region as drawn
+
+        The whole display is updated by `galactic.update`, the region
+        itself is not used.
+        """
+        self.dirty = True
+        self.event.set()
+
+    def flush(self):
+        """Update the display if a region is dirty"""
+        if not self.dirty:
+            return False
+
+        self.dirty = False
+        self.galactic.update(self.graphics)
+        return True
+
+    async def run(self):
+        while True:
+            await self.event.wait()
+            self.event.clear()
+
+            self.flush()
+
+            await asyncio.sleep_ms(self.frame_duration)
@@ -1,49 +1,60 @@
-from time import sleep
+from array import array
+from time import ticks_add, ticks_ms
 
-from .common import Clip
+from .common import Clip, Frames
 from .utils import from_hsv
 
 
 class CharacterSlideEffect:
-    """Character slide effect"""
+    """Character slide effect
+
+    The frames are scheduled on a deadline (see `Frames`): frames are
+    dropped when the drawing is late.
+    """
 
     # True: Down, False: Up
     direction = 1
 
-    async def update_time(self, time):
-        if self.last_time is None:
-            self.write_time(time)
-            self.last_time = time
+    # Duration of a frame in milliseconds
+    frame_duration = 10
 
-        _, HEIGHT = self.graphics.get_bounds()
+    def get_frames_count(self, height):
+        return (height * 2 if self.direction else height + 1) + 1
 
-        y = self.y
+    def get_frame_position(self, frame, height):
+        """Return the y position of the characters for the frame"""
         if not self.direction:
-            y += HEIGHT + 1
+            return self.y + height + 1 - frame
+
+        y = self.y + frame
+        return y if y < height else y - height * 2
 
-        for i in range(
-            (HEIGHT * 2 if self.direction else HEIGHT + 1) + 1
-        ):
-            for index, offset, size, a, b in self.iter_on_changes(time):
-                character = a if i <= HEIGHT else b
+    def draw_frame(self, time, frame, height):
+        y = self.get_frame_position(frame, height)
 
-                with Clip(self.graphics, self.x + offset, 0, size, HEIGHT):
-                    self.graphics.set_pen(self.background_color)
-                    self.graphics.clear()
+        for index, offset, size, a, b in self.iter_on_changes(time):
+            character = a if frame <= height else b
 
-                    self.callback_write_char(character, index)
-                    self.write_char(character, self.x + offset, y)
+            with Clip(self.graphics, self.x + offset, 0, size, height):
+                self.graphics.set_pen(self.background_color)
+                self.graphics.clear()
+
+                self.callback_write_char(character, index)
+                self.write_char(character, self.x + offset, y)
+
+    async def update_time(self, time):
+        if self.last_time is None:
+            self.write_time(time)
+            self.last_time = time
+            return
 
-            self.galactic.update(self.graphics)
+        _, HEIGHT = self.graphics.get_bounds()
 
-            if self.direction:
-                y += 1
-                if y >= HEIGHT:
-                    y = -HEIGHT
-            else:
-                y -= 1
+        frames = self.get_frames_count(HEIGHT)
 
-            sleep(0.01)
+        async for frame in Frames(frames, self.frame_duration):
+            self.draw_frame(time, frame, HEIGHT)
+            await self.flip()
 
         self.last_time = time
 
@@ -56,32 +67,178 @@ class CharacterSlideUpEffect(CharacterSlideEffect):
     direction = False
 
 
+class CharacterFadeEffect:
+    """Character fade effect
+
+    The old character dissolves into the new one with an ordered dither:
+    each pixel has a threshold from a 4 x 4 Bayer matrix, the frame `n`
+    switches the pixels of threshold `n`. The pixels which differ between
+    two characters are sorted by threshold once per pair of characters
+    (see `get_fade_order`), a frame only draws its own pixels in the
+    changed characters: no clear, no redraw. When a character moved (font
+    with variable width), the time is drawn without fade.
+
+    The frames are scheduled on a deadline (see `Frames`).
+    """
+
+    # Thresholds of the pixels, by (y % 4) * 4 + x % 4
+    bayer = bytes((0, 8, 2, 10, 12, 4, 14, 6, 3, 11, 1, 9, 15, 7, 13, 5))
+
+    # Duration of a frame in milliseconds
+    frame_duration = 15
+
+    # Fade orders, by (font metrics, old char, new char)
+    fade_orders = {}
+
+    def get_fade_order(self, old, new):
+        """Get the pixels switched from `old` to `new`, by threshold
+
+        Returns the (x, y, lighted) of the pixels flattened in a bytes and
+        the end (in pixels) of each threshold. Within a threshold, the
+        pixels to clear come first. Computed once per pair of characters
+        of a font.
+        """
+        key = (self.metrics, old, new)
+        try:
+            return self.fade_orders[key]
+        except KeyError:
+            pass
+
+        old_pixels = set(self.get_glyph(old))
+        new_pixels = set(self.get_glyph(new))
+
+        bayer = self.bayer
+        pixels = sorted(
+            (bayer[(py & 3) * 4 + (px & 3)], lighted, px, py)
+            for lighted, changed in (
+                (0, old_pixels - new_pixels),
+                (1, new_pixels - old_pixels),
+            )
+            for (px, py) in changed
+        )
+
+        order = bytearray()
+        ends = array('H', [0] * len(bayer))
+        for i, (threshold, lighted, px, py) in enumerate(pixels):
+            order += bytes((px, py, lighted))
+            ends[threshold] = i + 1
+
+        # The thresholds without pixels end where the previous one ends
+        for threshold in range(1, len(ends)):
+            ends[threshold] = max(ends[threshold], ends[threshold - 1])
+
+        fade_order = (bytes(order), ends)
+        self.fade_orders[key] = fade_order
+        return fade_order
+
+    def draw_fade(self, changes, start, end):
+        """Draw the pixels of the thresholds from `start` to `end`"""
+        graphics = self.graphics
+        pixel = graphics.pixel
+        callback = self.callback_set_pixel
+
+        for index, offset, size, old, new in changes:
+            order, ends = self.get_fade_order(old, new)
+            i = ends[start - 1] * 3 if start else 0
+            last = ends[end - 1] * 3
+            if i == last:
+                continue
+
+            x = self.x + offset
+            graphics.set_clip(x, 0, size, self.screen_height)
+            shift, _ = self.chars_font_bounds[new]
+
+            lighted = None
+            while i < last:
+                px, py = x + order[i], self.y + order[i + 1]
+                if order[i + 2]:
+                    if callback:
+                        callback(new, px + shift, py)
+                        lighted = True
+                    elif not lighted:
+                        self.callback_write_char(new, index)
+                        lighted = True
+                elif lighted is not False:
+                    graphics.set_pen(self.background_color)
+                    lighted = False
+
+                pixel(px, py)
+                i += 3
+
+            graphics.remove_clip()
+
+    async def update_time(self, time):
+        if self.last_time is None:
+            self.write_time(time)
+            self.last_time = time
+            return
+
+        # The pixels are switched in place, the moved characters are
+        # cleared and redrawn by the clock
+        if self.is_moved(time):
+            await super().update_time(time)
+            return
+
+        changes = tuple(self.iter_on_changes(time))
+        if not changes:
+            self.last_time = time
+            return
+
+        _, first, _, _, _ = changes[0]
+        _, end, size, _, _ = changes[-1]
+        x, width = self.x + first, end + size - first
+
+        drawn = 0
+        async for frame in Frames(len(self.bayer), self.frame_duration):
+            # The frames skipped when late are drawn with this one
+            self.draw_fade(changes, drawn, frame + 1)
+            drawn = frame + 1
+            await self.flip(x, width)
+
+        self.last_time = time
+
+
 class RainbowMixin:
 
     hue_offset = 0
-    hue_map = []
+
+    # Number of colors of the rainbow, the width of the clock if None
+    palette_size = None
+
+    # Pens of the rainbow, indexed by the quantized hue
+    hue_pens = []
 
     def callback_after_init(self):
         info = self.chars_bounds[-1]
         self.width = info[1] + info[2]
-        self.hue_map = [
-            from_hsv(x / self.width, 1.0, 1.0) for x in range(self.width)
-        ]
+
+        self.load_hue_pens()
 
         self.separator_color = self.graphics.create_pen(255, 255, 255)
 
+    def load_hue_pens(self):
+        """Create the pens of the rainbow
+
+        The pens are created only when the palette size changes.
+        """
+        size = self.palette_size or self.width
+        if len(self.hue_pens) == size:
+            return
+
+        self.hue_pens = [
+            self.graphics.create_pen(*from_hsv(x / size, 1.0, 1.0))
+            for x in range(size)
+        ]
+
     def set_pen(self, char, i):
-        color = self.separator_color
-
-        if char != ':':
-            colour = self.hue_map[
-                int((i + (self.hue_offset * self.width)) % self.width)
-            ]
-            color = self.graphics.create_pen(
-                int(colour[0]), int(colour[1]), int(colour[2])
-            )
+        if char == ':':
+            self.graphics.set_pen(self.separator_color)
+            return
 
-        self.graphics.set_pen(color)
+        size = len(self.hue_pens)
+        self.graphics.set_pen(self.hue_pens[
+            int(i * size / self.width + self.hue_offset * size) % size
+        ])
 
 
 class RainbowCharEffect(RainbowMixin):
@@ -108,14 +265,66 @@ class RainbowMoveEffect(RainbowMixin):
     """Rainbow move effect
 
     Colorize the characters as a rainbow and move it.
+
+    With `scanline`, the time is rendered once per change into a coverage
+    mask (the runs of lighted pixels of each column) and each frame only
+    recolors it: one pen per column and one rectangle per run.
     """
 
     loop_sleep = 0.01
 
+    scanline = True
+
+    # The time and the position of the coverage mask
+    mask_time = None
+    mask_x = mask_y = None
+    # List of (x, hue position, character, runs), runs are (y, height)
+    mask = []
+
     def callback_set_pixel(self, char, x, y):
         self.set_pen(char, x)
 
+    def load_mask(self, time):
+        """Render the time into the coverage mask"""
+        self.mask = []
+        for character, offset, size in self.get_chars_bounds(time):
+            start, _ = self.chars_font_bounds[character]
+
+            for px, runs in self.get_columns(character):
+                x = self.x + offset + px
+                self.mask.append((
+                    x,
+                    x + start,
+                    character,
+                    tuple((self.y + y, height) for (y, height) in runs),
+                ))
+
+        self.mask_time = time
+        self.mask_x, self.mask_y = self.x, self.y
+
+    def draw_mask(self):
+        rectangle = self.graphics.rectangle
+        for x, position, character, runs in self.mask:
+            self.set_pen(character, position)
+            for y, height in runs:
+                rectangle(x, y, 1, height)
+
     async def update_time(self, time):
+        if self.scanline:
+            if time != self.mask_time or self.x != self.mask_x or \
+                    self.y != self.mask_y:
+                self.load_mask(time)
+
+            with Clip(self.graphics, self.x, self.y, self.width,
+                      self.screen_height):
+                self.graphics.set_pen(self.background_color)
+                self.graphics.clear()
+
+                self.draw_mask()
+
+            await self.flip()
+            return
+
         for character, offset, size in self.get_chars_bounds(time):
             with Clip(self.graphics, self.x + offset, self.y, size,
                       self.screen_height):
@@ -124,7 +333,19 @@ class RainbowMoveEffect(RainbowMixin):
 
                 self.write_char(character, self.x + offset, self.y)
 
-        self.galactic.update(self.graphics)
+        await self.flip()
+
+    # ticks_ms of the last frame
+    frame_ticks = None
+
+    def get_deadline(self):
+        if self.frame_ticks is None:
+            return None
+        return ticks_add(self.frame_ticks, int(self.loop_sleep * 1000))
+
+    def check_next_second(self):
+        self.frame_ticks = ticks_ms()
+        return self.get_time()
 
     async def callback_time_updated(self, hour, minute, second):
         self.hue_offset += 0.01
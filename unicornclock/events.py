@@ -0,0 +1,82 @@
+import sys
+
+import uasyncio as asyncio
+
+
+class Subscriber:
+    """Subscriber of an event
+
+    The callback runs in its own task. The events waiting for it are kept
+    in a bounded queue, the oldest are dropped: a slow subscriber only
+    sees the latest events. An exception of the callback is printed, the
+    subscriber keeps receiving the next events.
+    """
+
+    task = None
+
+    def __init__(self, callback, queue_size=1):
+        self.callback = callback
+        self.queue_size = queue_size
+        self.queue = []
+        self.event = asyncio.Event()
+
+    def push(self, args):
+        if len(self.queue) >= self.queue_size:
+            self.queue.pop(0)
+        self.queue.append(args)
+
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+        self.event.set()
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        self.queue = []
+
+    async def run(self):
+        while True:
+            await self.event.wait()
+            self.event.clear()
+
+            while self.queue:
+                try:
+                    result = self.callback(*self.queue.pop(0))
+
+                    # The callback can be a coroutine function
+                    if hasattr(result, 'send'):
+                        await result
+                except Exception as e:
+                    sys.print_exception(e)
+
+
+class EventBus:
+    """Event bus
+
+    The subscribers run as scheduled tasks, publishing an event only
+    queues it.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+
+    def subscribe(self, event, callback, queue_size=1):
+        subscriber = Subscriber(callback, queue_size)
+        self.subscribers.setdefault(event, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, event, subscriber):
+        subscriber.cancel()
+        self.subscribers[event].remove(subscriber)
+
+    def publish(self, event, *args):
+        for subscriber in self.subscribers.get(event, ()):
+            subscriber.push(args)
+
+    def close(self):
+        """Stop the tasks of the subscribers"""
+        for subscribers in self.subscribers.values():
+            for subscriber in subscribers:
+                subscriber.cancel()
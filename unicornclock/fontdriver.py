@@ -1,11 +1,51 @@
+class FontMetrics:
+    """Font metrics
+
+    The bounds, the compiled glyphs, the sprites and the layouts (by
+    space between chars) of a font, shared by all the drivers using this
+    font.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.chars_font_bounds = {}
+        self.glyphs = {}
+        self.layouts = {}
+        self.columns = {}
+
+        # Sprites cache, from the least to the most recently used
+        self.sprites = {}
+        self.sprites_order = []
+        self.sprites_size = 0
+
+
+# Metrics of the loaded fonts, by font identity
+fonts_metrics = {}
+
 
 class FontDriver:
 
     # Save the start / end of each characters
     chars_font_bounds = {}
 
+    # Save the lighted pixels of each characters, already shifted by the
+    # start of the character
+    glyphs = {}
+
     space_between_char = 1
 
+    # Maximum number of texts in the layout cache
+    layout_cache_size = 4
+
+    # Layout of the last texts, see `get_layout`
+    layout_cache = {}
+    layout_spacing = None
+
+    metrics = None
+
+    # Memory budget of the sprites cache, in number of runs
+    sprites_budget = 256
+
     callback_write_char = None
     callback_set_pixel = None
 
@@ -15,6 +55,7 @@ class FontDriver:
         self.font = font
 
         self.load_chars_font_bounds()
+        self.select_write_char()
 
     def iter_pixel(self, char):
         """Iter pixel
@@ -26,14 +67,63 @@ class FontDriver:
                     yield (bit, y)
 
     def load_chars_font_bounds(self):
-        self.chars_font_bounds = {}
+        """Load the bounds and compile the glyph of each characters
+
+        The font bits are scanned only once here, the drawing methods
+        use the compiled glyphs.
+
+        When the font provides the bounds (see `BinaryFont`), the glyphs
+        are compiled on first use only.
+
+        The metrics are shared with the other drivers using the same font,
+        the font is scanned only by the first one.
+        """
+        metrics = fonts_metrics.get(id(self.font))
+        if metrics is not None and metrics.font is self.font:
+            self.use_metrics(metrics)
+            return
+
+        metrics = FontMetrics(self.font)
+        fonts_metrics[id(self.font)] = metrics
+        self.use_metrics(metrics)
+
+        get_bounds = getattr(self.font, 'get_bounds', None)
         for char in self.font:
-            min_x = 1000
-            max_x = 0
-            for (pos_x, pos_y) in self.iter_pixel(char):
-                min_x = min(min_x, pos_x)
-                max_x = max(max_x, pos_x)
-            self.chars_font_bounds[char] = (min_x, max_x)
+            if get_bounds:
+                self.chars_font_bounds[char] = get_bounds(char)
+            else:
+                self.load_glyph(char)
+
+    def use_metrics(self, metrics):
+        self.metrics = metrics
+        self.chars_font_bounds = metrics.chars_font_bounds
+        self.glyphs = metrics.glyphs
+        self.layout_spacing = None
+
+    def load_glyph(self, char):
+        pixels = list(self.iter_pixel(char))
+
+        min_x = 1000
+        max_x = 0
+        for (pos_x, pos_y) in pixels:
+            min_x = min(min_x, pos_x)
+            max_x = max(max_x, pos_x)
+        self.chars_font_bounds[char] = (min_x, max_x)
+
+        glyph = tuple((pos_x - min_x, pos_y) for (pos_x, pos_y) in pixels)
+        self.glyphs[char] = glyph
+        return glyph
+
+    def get_glyph(self, char):
+        try:
+            return self.glyphs[char]
+        except KeyError:
+            pass
+
+        if char not in self.font:
+            raise Exception("Character '%s' not found in font." % char)
+
+        return self.load_glyph(char)
 
     def iter_chars(self, text):
         """Iters on chars in the text argument
@@ -58,26 +148,154 @@ class FontDriver:
 
             offset += character_width + space_between_char
 
+    def get_spacing_key(self):
+        spacing = self.space_between_char
+        if callable(spacing):
+            # A bound method is created on each access, the class (or the
+            # instance function) identifies it
+            return self.__dict__.get('space_between_char', type(self))
+        return spacing
+
+    def get_layout(self, text):
+        """Get the layout of the text
+
+        Same values as `iter_chars` in a tuple, cached by text and shared by
+        the drivers using the same font and space between chars.
+        """
+        spacing = self.get_spacing_key()
+        if self.layout_spacing != spacing:
+            self.layout_cache = self.metrics.layouts.setdefault(spacing, {})
+            self.layout_spacing = spacing
+
+        try:
+            return self.layout_cache[text]
+        except KeyError:
+            pass
+
+        if len(self.layout_cache) >= self.layout_cache_size:
+            self.layout_cache.clear()
+
+        layout = tuple(self.iter_chars(text))
+        self.layout_cache[text] = layout
+        return layout
+
     def get_chars_bounds(self, text):
-        yield from self.iter_chars(text)
+        return self.get_layout(text)
 
-    def write_char(self, char, x, y=0):
-        char = str(char)
+    def load_sprite(self, char):
+        """Pre-render the glyph as horizontal runs of lighted pixels
+
+        Returns a tuple of (x, y, width).
+        """
+        # The glyph pixels are ordered by row then column
+        runs = []
+        for (px, py) in self.get_glyph(char):
+            if runs and runs[-1][1] == py and \
+                    runs[-1][0] + runs[-1][2] == px:
+                runs[-1][2] += 1
+            else:
+                runs.append([px, py, 1])
+
+        return tuple(tuple(run) for run in runs)
+
+    def get_sprite(self, char):
+        """Get the sprite of the character
+
+        The sprites are kept in a LRU cache, the least recently used are
+        evicted when the cache exceeds `sprites_budget` runs.
+        """
+        metrics = self.metrics
+        order = metrics.sprites_order
 
         try:
-            self.font[str(char)]
+            sprite = metrics.sprites[char]
         except KeyError:
-            raise Exception("Character '%s' not found in font." % char)
+            pass
+        else:
+            if order[-1] != char:
+                order.remove(char)
+                order.append(char)
+            return sprite
 
-        start, _ = self.chars_font_bounds[char]
-        for (px, py) in self.iter_pixel(char):
-            if self.callback_set_pixel:
-                self.callback_set_pixel(char, x + px, y + py)
+        sprite = self.load_sprite(char)
+        metrics.sprites[char] = sprite
+        metrics.sprites_size += len(sprite)
+        order.append(char)
+
+        while metrics.sprites_size > self.sprites_budget and len(order) > 1:
+            evicted = order.pop(0)
+            metrics.sprites_size -= len(metrics.sprites.pop(evicted))
+
+        return sprite
+
+    def get_columns(self, char):
+        """Get the glyph as vertical runs of lighted pixels
 
-            self.graphics.pixel(x + px - start, y + py)
+        Returns a tuple of (x, runs) for each lighted column, runs are
+        (y, height).
+        """
+        try:
+            return self.metrics.columns[char]
+        except KeyError:
+            pass
+
+        rows = {}
+        for (px, py) in self.get_glyph(char):
+            rows.setdefault(px, []).append(py)
+
+        columns = []
+        for px in sorted(rows):
+            runs = []
+            for py in sorted(rows[px]):
+                if runs and runs[-1][0] + runs[-1][1] == py:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([py, 1])
+
+            columns.append((px, tuple(tuple(run) for run in runs)))
+
+        columns = tuple(columns)
+        self.metrics.columns[char] = columns
+        return columns
+
+    def select_write_char(self):
+        """Choose the drawing routine of `write_char`
+
+        Done once at setup: without `callback_set_pixel`, the characters
+        are drawn by the sprite routine and no hook is checked while
+        drawing. A subclass overriding `write_char` is left as is.
+        """
+        if type(self).write_char is not FontDriver.write_char:
+            return
+
+        if self.callback_set_pixel:
+            self.write_char = self.write_char_pixels
+        else:
+            self.write_char = self.write_char_sprite
+
+    def write_char(self, char, x, y=0):
+        if self.callback_set_pixel:
+            self.write_char_pixels(char, x, y)
+        else:
+            self.write_char_sprite(char, x, y)
+
+    @micropython.native  # noqa: F821
+    def write_char_sprite(self, char, x, y=0):
+        # Same color for the whole character, draw the sprite
+        rectangle = self.graphics.rectangle
+        for run in self.get_sprite(char):
+            rectangle(x + run[0], y + run[1], run[2], 1)
+
+    def write_char_pixels(self, char, x, y=0):
+        callback = self.callback_set_pixel
+        pixel = self.graphics.pixel
+        start, _ = self.chars_font_bounds[char]
+        for (px, py) in self.get_glyph(char):
+            callback(char, x + px + start, y + py)
+            pixel(x + px, y + py)
 
     def write_text(self, text, x, y):
-        for i, (char, offset, _) in enumerate(self.iter_chars(text)):
+        for i, (char, offset, _) in enumerate(self.get_layout(text)):
             if self.callback_write_char:
                 self.callback_write_char(char, i)
 
@@ -0,0 +1,109 @@
+"""Binary font file
+
+A compact font format read from the flash on demand:
+
+- Header: magic `UCF1`, number of glyphs (uint16)
+- Index, one entry per glyph: code point (uint16), rows offset (uint16),
+  rows count (uint8), min x (uint8), max x (uint8)
+- Rows: one byte per row, like the fonts of `fonts.py`
+
+A glyph without lighted pixel has a min x of 255.
+"""
+import struct
+
+MAGIC = b'UCF1'
+
+HEADER = '<4sH'
+HEADER_SIZE = struct.calcsize(HEADER)
+
+ENTRY = '<HHBBB'
+ENTRY_SIZE = struct.calcsize(ENTRY)
+
+EMPTY = 255
+
+
+def get_font_bounds(rows):
+    min_x = EMPTY
+    max_x = 0
+    for c in rows:
+        for bit in range(8):
+            if c & (1 << bit):
+                min_x = min(min_x, bit)
+                max_x = max(max_x, bit)
+    return min_x, max_x
+
+
+def write_font(font, path):
+    """Convert a font of `fonts.py` into a binary font file"""
+    chars = sorted(font)
+    offset = HEADER_SIZE + ENTRY_SIZE * len(chars)
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack(HEADER, MAGIC, len(chars)))
+
+        for char in chars:
+            rows = font[char]
+            min_x, max_x = get_font_bounds(rows)
+            f.write(struct.pack(
+                ENTRY, ord(char), offset, len(rows), min_x, max_x,
+            ))
+            offset += len(rows)
+
+        for char in chars:
+            f.write(bytes(font[char]))
+
+
+class BinaryFont:
+    """Binary font
+
+    Used like a font of `fonts.py`, only the index is loaded in RAM, the
+    rows of a glyph are read from the file on first use.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+
+        magic, count = struct.unpack(HEADER, self.file.read(HEADER_SIZE))
+        if magic != MAGIC:
+            raise Exception("'%s' is not a font file." % path)
+
+        index = self.file.read(ENTRY_SIZE * count)
+
+        self.index = {}
+        for i in range(count):
+            code, offset, size, min_x, max_x = struct.unpack_from(
+                ENTRY, index, i * ENTRY_SIZE,
+            )
+            self.index[chr(code)] = (offset, size, min_x, max_x)
+
+        self.rows = {}
+
+    def get_bounds(self, char):
+        _, _, min_x, max_x = self.index[char]
+
+        # Same bounds as `FontDriver` for a glyph without lighted pixel
+        return (1000 if min_x == EMPTY else min_x), max_x
+
+    def close(self):
+        self.file.close()
+
+    def __getitem__(self, char):
+        try:
+            return self.rows[char]
+        except KeyError:
+            pass
+
+        offset, size, _, _ = self.index[char]
+        self.file.seek(offset)
+        rows = self.file.read(size)
+        self.rows[char] = rows
+        return rows
+
+    def __contains__(self, char):
+        return char in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
@@ -0,0 +1,256 @@
+from .common import Frames
+from .utils import from_hsv
+
+
+# Granularity of the colors of a colorizer, from the cheapest to draw
+PER_CHAR = 0
+PER_COLUMN = 1
+PER_PIXEL = 2
+
+
+class Colorizer:
+    """Colorizer stage
+
+    Set the pen of the drawn characters. `mode` is the granularity the
+    colorizer needs, the pipeline draws with the cheapest path for it:
+    - PER_CHAR: one pen per character (`set_char_pen`), the glyph is
+      drawn as horizontal runs.
+    - PER_COLUMN: one pen per column (`set_column_pen`), the glyph is
+      drawn as vertical runs.
+    - PER_PIXEL: one pen per pixel (`set_pixel_pen`).
+
+    The default colorizer uses the `callback_write_char` of the clock.
+    """
+
+    mode = PER_CHAR
+
+    def setup(self, clock):
+        self.clock = clock
+        self.graphics = clock.graphics
+
+    def set_char_pen(self, char, index):
+        self.clock.callback_write_char(char, index)
+
+    def set_column_pen(self, char, index, x):
+        self.set_char_pen(char, index)
+
+    def set_pixel_pen(self, char, index, x, y):
+        self.set_column_pen(char, index, x)
+
+
+class RainbowColorizer(Colorizer):
+    """Rainbow colorizer
+
+    The color of each character comes from a rainbow, the separators are
+    white.
+    """
+
+    hue_offset = 0
+
+    # Number of colors of the rainbow, the width of the clock if None
+    palette_size = None
+
+    def setup(self, clock):
+        super().setup(clock)
+
+        size = self.palette_size or clock.width
+        self.hue_pens = [
+            self.graphics.create_pen(*from_hsv(x / size, 1.0, 1.0))
+            for x in range(size)
+        ]
+        self.separator_color = self.graphics.create_pen(255, 255, 255)
+
+    def set_hue_pen(self, char, x):
+        """Set the pen of the rainbow at the x position of the clock"""
+        if char == ':':
+            self.graphics.set_pen(self.separator_color)
+            return
+
+        size = len(self.hue_pens)
+        self.graphics.set_pen(self.hue_pens[
+            int(x * size / self.clock.width + self.hue_offset * size) % size
+        ])
+
+    def set_char_pen(self, char, index):
+        self.set_hue_pen(char, self.clock.chars_bounds[index][1])
+
+    def set_column_pen(self, char, index, x):
+        self.set_hue_pen(char, x - self.clock.x)
+
+
+class RainbowColumnColorizer(RainbowColorizer):
+    """Rainbow colorizer, the color changes on each column"""
+
+    mode = PER_COLUMN
+
+
+class Transition:
+    """Transition stage
+
+    Draw the frames of a changed character. `change` comes from
+    `Clock.iter_on_changes`: (index, offset, size, old char, new char).
+
+    The default transition replaces the character in a single frame.
+    """
+
+    frames = 1
+
+    # Duration of a frame in milliseconds
+    frame_duration = 10
+
+    def setup(self, clock):
+        self.clock = clock
+
+    def get_frames_count(self):
+        return self.frames
+
+    def is_changed(self, frame, next_frame):
+        """Returns False when the frames are the same, it is not drawn"""
+        return True
+
+    def draw(self, pipeline, change, frame):
+        index, offset, _, _, char = change
+        pipeline.draw_char(char, index, self.clock.x + offset, self.clock.y)
+
+
+class SlideTransition(Transition):
+    """Slide transition
+
+    The old character leaves the clock while the new one comes in.
+    """
+
+    # True: Down, False: Up
+    direction = True
+
+    def setup(self, clock):
+        super().setup(clock)
+        height = clock.screen_height
+        self.frames = (height * 2 if self.direction else height + 1) + 1
+
+    def draw(self, pipeline, change, frame):
+        index, offset, _, old, new = change
+        height = self.clock.screen_height
+
+        if self.direction:
+            y = self.clock.y + frame
+            if y >= height:
+                y -= height * 2
+        else:
+            y = self.clock.y + height + 1 - frame
+
+        char = old if frame <= height else new
+        pipeline.draw_char(char, index, self.clock.x + offset, y)
+
+
+class SlideDownTransition(SlideTransition):
+    direction = True
+
+
+class SlideUpTransition(SlideTransition):
+    direction = False
+
+
+class Pipeline:
+    """Render pipeline of a clock
+
+    The time is drawn by stages: the layout (`Clock.iter_on_changes`
+    gives the changed characters), the transition (the frames of each
+    change), the colorizer (the pens) and the blit (the drawing of the
+    glyphs). The stages are assembled once, the blit routine is chosen
+    by the colorizer mode.
+
+    A stage can be given as a class, it is instantiated for the clock.
+    """
+
+    def __init__(self, clock, transition=None, colorizer=None):
+        self.clock = clock
+        self.graphics = clock.graphics
+        self.transition = self.get_stage(transition, Transition)
+        self.colorizer = self.get_stage(colorizer, Colorizer)
+
+    @staticmethod
+    def get_stage(stage, default):
+        if stage is None:
+            stage = default
+        if isinstance(stage, type):
+            stage = stage()
+        return stage
+
+    def setup(self):
+        """Set up the stages, called once the clock settings are known"""
+        self.colorizer.setup(self.clock)
+        self.transition.setup(self.clock)
+
+        mode = self.colorizer.mode
+        if mode == PER_CHAR:
+            self.draw_char = self.blit_sprite
+        elif mode == PER_COLUMN:
+            self.draw_char = self.blit_columns
+        else:
+            self.draw_char = self.blit_pixels
+
+    def blit_sprite(self, char, index, x, y):
+        self.colorizer.set_char_pen(char, index)
+        self.clock.write_char_sprite(char, x, y)
+
+    def blit_columns(self, char, index, x, y):
+        set_column_pen = self.colorizer.set_column_pen
+        rectangle = self.graphics.rectangle
+        for px, runs in self.clock.get_columns(char):
+            set_column_pen(char, index, x + px)
+            for (py, height) in runs:
+                rectangle(x + px, y + py, 1, height)
+
+    def blit_pixels(self, char, index, x, y):
+        set_pixel_pen = self.colorizer.set_pixel_pen
+        pixel = self.graphics.pixel
+        for (px, py) in self.clock.get_glyph(char):
+            set_pixel_pen(char, index, x + px, y + py)
+            pixel(x + px, y + py)
+
+    def draw_frame(self, changes, frame):
+        clock = self.clock
+        graphics = self.graphics
+        for change in changes:
+            _, offset, size, _, _ = change
+            graphics.set_clip(clock.x + offset, 0, size, clock.screen_height)
+            graphics.set_pen(clock.background_color)
+            graphics.clear()
+
+            self.transition.draw(self, change, frame)
+
+            graphics.remove_clip()
+
+    async def update_time(self, time):
+        """Draw the changes of the time, frame by frame
+
+        The frames are scheduled on a deadline (see `Frames`), the first
+        time is drawn without transition.
+        """
+        clock = self.clock
+        changes = tuple(clock.iter_on_changes(time))
+        if not changes:
+            clock.last_time = time
+            return
+
+        _, start, _, _, _ = changes[0]
+        _, end, size, _, _ = changes[-1]
+        x, width = clock.x + start, end + size - start
+
+        frames = self.transition.get_frames_count()
+        first = 0
+        if clock.last_time is None:
+            first = frames - 1
+
+        drawn = None
+        async for frame in Frames(
+                frames, self.transition.frame_duration, first):
+            # The last frame is always drawn, it can differ from a frame of
+            # same progress (see `FadeTransition`)
+            if drawn is None or frame == frames - 1 or \
+                    self.transition.is_changed(drawn, frame):
+                self.draw_frame(changes, frame)
+                await clock.flip(x, width)
+                drawn = frame
+
+        clock.last_time = time
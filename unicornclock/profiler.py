@@ -0,0 +1,233 @@
+"""Frame budget profiler
+
+Opt-in: nothing is instrumented until `Profiler.attach` is called, so the
+production code pays nothing for it.
+
+    profiler = Profiler()
+    profiler.attach(clock, brightness, calendar)
+    asyncio.create_task(profiler.run())
+"""
+import uasyncio as asyncio
+from array import array
+from time import ticks_diff, ticks_us
+
+# Methods instrumented by `attach`, when they exist, with their number of
+# arguments: the wrappers have a fixed arity, no allocation per call
+METHODS = (
+    ('tick', 3),
+    ('update_time', 1),
+    ('write_char', 3),
+    ('update', 0),
+    ('refresh', 0),
+    ('draw_all', 1),
+)
+
+# Instrumented methods which are coroutines
+ASYNC_METHODS = ('tick', 'update_time', 'refresh')
+
+
+def call(func, arity, a, b, c):
+    """Call `func` with its `arity` first arguments"""
+    if arity == 0:
+        return func()
+    if arity == 1:
+        return func(a)
+    if arity == 2:
+        return func(a, b)
+    return func(a, b, c)
+
+
+class Stat:
+    """Timings of a method
+
+    The durations (in microseconds) of the last calls and the number of
+    calls of the last frames are kept in fixed-size ring buffers.
+    """
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.durations = array('l', [0] * size)
+        self.frame_calls = array('l', [0] * size)
+        self.count = 0
+        self.frames = 0
+        self.calls = 0
+        self.max = 0
+
+    def add(self, duration):
+        self.durations[self.count % self.size] = duration
+        self.count += 1
+        self.calls += 1
+        if duration > self.max:
+            self.max = duration
+
+    def end_frame(self):
+        self.frame_calls[self.frames % self.size] = self.calls
+        self.frames += 1
+        self.calls = 0
+
+    def export(self):
+        count = min(self.count, self.size)
+        frames = min(self.frames, self.size)
+        return {
+            'count': self.count,
+            'mean': sum(self.durations[:count]) / count if count else 0,
+            'max': self.max,
+            'last': self.durations[(self.count - 1) % self.size]
+            if count else 0,
+            'calls_per_frame': sum(self.frame_calls[:frames]) / frames
+            if frames else 0,
+        }
+
+
+class ProfiledGalactic:
+    """GalacticUnicorn proxy timing `update`, each update ends a frame"""
+
+    def __init__(self, galactic, profiler):
+        self.galactic = galactic
+        self.profiler = profiler
+        self.stat = profiler.get_stat('galactic.update')
+
+    def update(self, graphics):
+        start = ticks_us()
+        self.galactic.update(graphics)
+        self.stat.add(ticks_diff(ticks_us(), start))
+        self.profiler.end_frame()
+
+    def __getattr__(self, name):
+        return getattr(self.galactic, name)
+
+
+class Profiler:
+
+    # Size of the ring buffers
+    size = 64
+
+    def __init__(self, size=None):
+        if size is not None:
+            self.size = size
+
+        self.stats = {}
+        self.stats_list = []
+        self.galactics = {}
+
+    def get_stat(self, name):
+        try:
+            return self.stats[name]
+        except KeyError:
+            pass
+
+        stat = Stat(name, self.size)
+        self.stats[name] = stat
+        self.stats_list.append(stat)
+        return stat
+
+    def end_frame(self):
+        for stat in self.stats_list:
+            stat.end_frame()
+
+    def watch(self, obj, name, arity, key=None, is_async=False, waited=None):
+        """Time the calls of the method `name` of `obj`
+
+        The optional arguments of the method default to None. `waited` is
+        the time spent waiting for the display updates (see `watch_flip`),
+        it is not counted in the coroutines.
+        """
+        func = getattr(obj, name)
+        stat = self.get_stat(key or '%s.%s' % (type(obj).__name__, name))
+
+        if is_async:
+            if waited is None:
+                waited = array('l', [0])
+
+            async def wrapper(a=None, b=None, c=None):
+                start = ticks_us()
+                flips = waited[0]
+                result = await call(func, arity, a, b, c)
+                stat.add(ticks_diff(ticks_us(), start) - (waited[0] - flips))
+                return result
+        else:
+            def wrapper(a=None, b=None, c=None):
+                start = ticks_us()
+                result = call(func, arity, a, b, c)
+                stat.add(ticks_diff(ticks_us(), start))
+                return result
+
+        setattr(obj, name, wrapper)
+
+    def watch_flip(self, obj, waited):
+        """Time the display updates of a clock (`flip`), the wait for the
+        second change included, and add it to `waited`
+        """
+        func = obj.flip
+        stat = self.get_stat('%s.flip' % type(obj).__name__)
+
+        async def wrapper(x=None, width=None):
+            start = ticks_us()
+            await func(x, width)
+            duration = ticks_diff(ticks_us(), start)
+            stat.add(duration)
+            waited[0] += duration
+
+        obj.flip = wrapper
+
+    def attach(self, *objects):
+        """Instrument the widgets
+
+        Time the known methods of the objects (see `METHODS`, `tick` is
+        the work of a clock per second) and the display updates. The wait
+        of a clock for the second change (`flip`) is timed apart.
+        """
+        for obj in objects:
+            waited = array('l', [0])
+            if callable(getattr(obj, 'flip', None)):
+                self.watch_flip(obj, waited)
+
+            for name, arity in METHODS:
+                if callable(getattr(obj, name, None)):
+                    self.watch(
+                        obj,
+                        name,
+                        arity,
+                        is_async=name in ASYNC_METHODS,
+                        waited=waited,
+                    )
+
+            galactic = getattr(obj, 'galactic', None)
+            if galactic is not None:
+                obj.galactic = self.get_galactic(galactic)
+
+            compositor = getattr(obj, 'compositor', None)
+            if compositor is not None:
+                compositor.galactic = self.get_galactic(compositor.galactic)
+
+    def get_galactic(self, galactic):
+        if isinstance(galactic, ProfiledGalactic):
+            return galactic
+
+        key = id(galactic)
+        if key not in self.galactics:
+            self.galactics[key] = ProfiledGalactic(galactic, self)
+        return self.galactics[key]
+
+    def export(self):
+        return {stat.name: stat.export() for stat in self.stats_list}
+
+    def print_summary(self):
+        print('%-36s %8s %8s %8s %8s' % (
+            'Frame budget (us)', 'count', 'mean', 'max', 'calls',
+        ))
+        for name, stat in self.export().items():
+            print('%-36s %8i %8i %8i %8.1f' % (
+                name,
+                stat['count'],
+                stat['mean'],
+                stat['max'],
+                stat['calls_per_frame'],
+            ))
+
+    async def run(self, period=10):
+        """Print the summary every `period` seconds"""
+        while True:
+            await asyncio.sleep(period)
+            self.print_summary()
@@ -0,0 +1,103 @@
+import uasyncio as asyncio
+from time import ticks_diff, ticks_ms
+
+from .compositor import Compositor
+
+
+class Screen(Compositor):
+    """Screen
+
+    Layout manager of the widgets (`Clock`, `Calendar`, `Brightness`...)
+    with a single render loop: the loop refreshes the widgets which are
+    dirty or whose deadline is reached (see `get_deadline` and `refresh`),
+    then sleeps until the earliest deadline, or until a widget is added,
+    moved or refreshed. The widgets draw through the screen compositor,
+    the display is updated at most once per frame.
+
+    Each refresh runs in its own task: a widget waiting (animation, clock
+    waiting for the second change) does not delay the others.
+    """
+
+    # Maximal sleep of the render loop in milliseconds
+    max_sleep = 1000
+
+    def __init__(self, galactic, graphics, background_color=None,
+                 frame_duration=None):
+        super().__init__(galactic, graphics, frame_duration)
+        self.background_color = background_color
+        self.widgets = []
+
+        # Widgets being refreshed, see `refresh`
+        self.refreshing = []
+
+        # Set to wake up the render loop
+        self.wake = asyncio.Event()
+
+    def add(self, widget, x=None, y=None):
+        if x is not None:
+            widget.set_position(x, y)
+
+        if hasattr(widget, 'compositor'):
+            widget.compositor = self
+
+        self.widgets.append(widget)
+        self.wake.set()
+        return widget
+
+    def remove(self, widget):
+        self.widgets.remove(widget)
+        if getattr(widget, 'compositor', None) is self:
+            widget.compositor = None
+
+    def move(self, widget, x, y=None):
+        """Move the widget, its previous area is cleared"""
+        self.clear(*widget.get_bounds())
+        widget.set_position(x, y)
+        self.wake.set()
+
+    def clear(self, x, y, width, height):
+        if self.background_color is None:
+            self.background_color = self.graphics.create_pen(0, 0, 0)
+
+        self.graphics.set_pen(self.background_color)
+        self.graphics.rectangle(x, y, width, height)
+        self.mark_dirty(x, y, width, height)
+
+    async def refresh(self, widget):
+        """Refresh the widget, the render loop is woken up at the end"""
+        try:
+            await widget.refresh()
+        finally:
+            self.refreshing.remove(widget)
+            self.wake.set()
+
+    async def run(self):
+        # The frames of the animations are displayed while the render loop
+        # is busy
+        asyncio.create_task(super().run())
+
+        while True:
+            self.wake.clear()
+
+            now = ticks_ms()
+            delay = self.max_sleep
+            for widget in self.widgets:
+                # Its deadline is known once refreshed
+                if widget in self.refreshing:
+                    continue
+
+                deadline = widget.get_deadline()
+                if getattr(widget, 'dirty', False) or deadline is None or \
+                        ticks_diff(deadline, now) <= 0:
+                    self.refreshing.append(widget)
+                    asyncio.create_task(self.refresh(widget))
+                    continue
+
+                delay = min(delay, ticks_diff(deadline, now))
+
+            self.flush()
+
+            try:
+                await asyncio.wait_for_ms(self.wake.wait(), max(0, delay))
+            except asyncio.TimeoutError:
+                pass
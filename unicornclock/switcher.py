@@ -0,0 +1,71 @@
+class EffectSwitcher:
+    """Effect switcher
+
+    Switch the clock between effects (clock classes) at run time: the
+    running clock is stopped (its task is cancelled) before the next one
+    starts, only one clock draws at a time. The next clock displays the
+    time on its first frame.
+
+    The keyword arguments are the default arguments of the clocks.
+    """
+
+    # Clear the whole screen on a switch instead of the clock area
+    clear_screen = False
+
+    def __init__(self, galactic, graphics, effects, background_color=None,
+                 clear_screen=None, **kwargs):
+        self.galactic = galactic
+        self.graphics = graphics
+        self.effects = effects
+        self.kwargs = kwargs
+
+        if background_color is None:
+            background_color = graphics.create_pen(0, 0, 0)
+        self.background_color = background_color
+
+        if clear_screen is not None:
+            self.clear_screen = clear_screen
+
+        self.clock = None
+        self.index = None
+
+    def clear(self, clock):
+        graphics = self.graphics
+        graphics.remove_clip()
+        graphics.set_pen(self.background_color)
+
+        if self.clear_screen:
+            graphics.clear()
+            x, width = 0, self.galactic.WIDTH
+        else:
+            x, width = clock.x, clock.width
+            graphics.rectangle(x, 0, width, clock.screen_height)
+
+        clock.update_display(x, 0, width, clock.screen_height)
+
+    async def load(self, index, **kwargs):
+        """Stop the running clock and start the effect `index`"""
+        if self.clock:
+            await self.clock.stop()
+            self.clear(self.clock)
+
+        clock_kwargs = dict(self.kwargs)
+        clock_kwargs.update(kwargs)
+
+        self.clock = self.effects[index](
+            self.galactic,
+            self.graphics,
+            **clock_kwargs,
+        )
+        self.index = index
+
+        self.clock.start()
+        return self.clock
+
+    async def next(self, **kwargs):
+        index = 0 if self.index is None else self.index + 1
+        return await self.load(index % len(self.effects), **kwargs)
+
+    async def stop(self):
+        if self.clock:
+            await self.clock.stop()
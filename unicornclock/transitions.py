@@ -0,0 +1,260 @@
+from .pipeline import PER_CHAR, Transition
+
+
+def linear(t):
+    return t
+
+
+def ease_in(t):
+    return t * t
+
+
+def ease_out(t):
+    return t * (2 - t)
+
+
+def ease_in_out(t):
+    if t < 0.5:
+        return 2 * t * t
+    return -1 + (4 - 2 * t) * t
+
+
+def bounce(t):
+    """Ease out with a bounce at the end"""
+    if t < 1 / 2.75:
+        return 7.5625 * t * t
+    if t < 2 / 2.75:
+        t -= 1.5 / 2.75
+        return 7.5625 * t * t + 0.75
+    if t < 2.5 / 2.75:
+        t -= 2.25 / 2.75
+        return 7.5625 * t * t + 0.9375
+    t -= 2.625 / 2.75
+    return 7.5625 * t * t + 0.984375
+
+
+# Offset tables, by (easing, frames count, scale)
+tables = {}
+
+
+def get_table(easing, frames, scale):
+    """Get the eased values of each frame, from 0 to `scale` (255 max)
+
+    The tables are computed once and shared by the transitions.
+    """
+    key = (easing, frames, scale)
+    try:
+        return tables[key]
+    except KeyError:
+        pass
+
+    table = bytes([
+        min(scale, max(0, int(
+            easing(frame / (frames - 1) if frames > 1 else 1) * scale + 0.5
+        )))
+        for frame in range(frames)
+    ])
+
+    tables[key] = table
+    return table
+
+
+class EasedTransition(Transition):
+    """Eased transition
+
+    The progress of each frame comes from a table computed once from the
+    `easing` curve (`linear`, `ease_in`, `ease_out`, `ease_in_out`,
+    `bounce`...), from 0 to the scale of the transition. The frames with
+    the same progress are drawn once.
+    """
+
+    frames = 12
+
+    easing = staticmethod(ease_in_out)
+
+    table = b''
+
+    def __init__(self, easing=None, frames=None, frame_duration=None):
+        if easing is not None:
+            self.easing = easing
+        if frames is not None:
+            self.frames = frames
+        if frame_duration is not None:
+            self.frame_duration = frame_duration
+
+    def get_scale(self):
+        return 255
+
+    def setup(self, clock):
+        super().setup(clock)
+        self.table = get_table(self.easing, self.frames, self.get_scale())
+
+    def is_changed(self, frame, next_frame):
+        return self.table[frame] != self.table[next_frame]
+
+
+class EasedSlideTransition(EasedTransition):
+    """Slide transition with easing
+
+    The old character is pushed out by the new one.
+    """
+
+    # True: Down, False: Up
+    direction = True
+
+    def get_scale(self):
+        return self.clock.screen_height
+
+    def draw(self, pipeline, change, frame):
+        index, offset, _, old, new = change
+        height = self.clock.screen_height
+        x, y = self.clock.x + offset, self.clock.y
+
+        shift = self.table[frame]
+        if not self.direction:
+            shift = -shift
+
+        # The characters out of the screen are not drawn
+        if shift != height and shift != -height:
+            pipeline.draw_char(old, index, x, y + shift)
+        if shift:
+            pipeline.draw_char(
+                new,
+                index,
+                x,
+                y + shift - height if self.direction else y + shift + height,
+            )
+
+
+class WipeTransition(EasedTransition):
+    """Wipe transition
+
+    The new character is revealed from the left to the right.
+    """
+
+    def draw(self, pipeline, change, frame):
+        index, offset, size, old, new = change
+        graphics = pipeline.graphics
+        x, y = self.clock.x + offset, self.clock.y
+        height = self.clock.screen_height
+
+        width = size * self.table[frame] // 255
+        if width < size:
+            graphics.set_clip(x + width, 0, size - width, height)
+            pipeline.draw_char(old, index, x, y)
+        if width:
+            graphics.set_clip(x, 0, width, height)
+            pipeline.draw_char(new, index, x, y)
+
+
+class FadeTransition(EasedTransition):
+    """Fade transition
+
+    The old character fades out, then the new one fades in. The fade
+    is drawn with the pens of `color` at `levels` brightness levels, the
+    colorizer draws the last frame.
+    """
+
+    frames = 16
+
+    levels = 8
+
+    color = (255, 255, 255)
+
+    def get_scale(self):
+        return (self.levels - 1) * 2
+
+    def setup(self, clock):
+        super().setup(clock)
+
+        r, g, b = self.color
+        last = self.levels - 1
+        self.pens = [
+            clock.graphics.create_pen(
+                r * level // last,
+                g * level // last,
+                b * level // last,
+            )
+            for level in range(self.levels)
+        ]
+
+    def draw(self, pipeline, change, frame):
+        index, offset, _, old, new = change
+        x, y = self.clock.x + offset, self.clock.y
+
+        if frame == self.frames - 1:
+            pipeline.draw_char(new, index, x, y)
+            return
+
+        last = self.levels - 1
+        value = self.table[frame]
+        if value <= last:
+            char, level = old, last - value
+        else:
+            char, level = new, value - last
+
+        if level:
+            pipeline.graphics.set_pen(self.pens[level])
+            self.clock.write_char_sprite(char, x, y)
+
+
+# Dissolve thresholds of a 16 x 16 pattern, see `get_thresholds`
+thresholds = None
+
+
+def get_thresholds():
+    """Get a scattered threshold (0 to 255) for each pixel of a 16 x 16
+    pattern, computed once
+    """
+    global thresholds
+
+    if thresholds is None:
+        # Each threshold once, scattered by a linear congruential
+        # generator (its high bits, rotated, are the most random)
+        thresholds = bytearray(256)
+        value = 0
+        for i in range(256):
+            value = (value * 149 + 87) % 256
+            thresholds[i] = ((value >> 3) | (value << 5)) & 255
+
+    return thresholds
+
+
+class DissolveTransition(EasedTransition):
+    """Dissolve transition
+
+    The pixels of the old character are replaced by the pixels of the
+    new one in a scattered order.
+    """
+
+    def setup(self, clock):
+        super().setup(clock)
+        self.thresholds = get_thresholds()
+
+    def draw_pixels(self, pipeline, char, index, x, y, progress, appear):
+        colorizer = pipeline.colorizer
+        per_char = colorizer.mode == PER_CHAR
+        if per_char:
+            colorizer.set_char_pen(char, index)
+
+        thresholds = self.thresholds
+        pixel = pipeline.graphics.pixel
+        for (px, py) in self.clock.get_glyph(char):
+            if (thresholds[(py & 15) * 16 + (px & 15)] < progress) != appear:
+                continue
+
+            if not per_char:
+                colorizer.set_pixel_pen(char, index, x + px, y + py)
+            pixel(x + px, y + py)
+
+    def draw(self, pipeline, change, frame):
+        index, offset, _, old, new = change
+        x, y = self.clock.x + offset, self.clock.y
+
+        progress = self.table[frame]
+        if progress == 255:
+            pipeline.draw_char(new, index, x, y)
+            return
+
+        self.draw_pixels(pipeline, old, index, x, y, progress, False)
+        self.draw_pixels(pipeline, new, index, x, y, progress, True)
@@ -1,4 +1,5 @@
 import uasyncio as asyncio
+from time import ticks_add, ticks_diff, ticks_ms
 
 from .common import Clip, ClockMixin, Position
 
@@ -23,12 +24,14 @@ class Calendar(ClockMixin):
             banner_color=None,
             day_color=None,
             rtc=None,
+            compositor=None,
         ):
         self.galactic = galactic
         self.graphics = graphics
         self.background_color = background_color
         self.banner_color = banner_color
         self.day_color = day_color
+        self.compositor = compositor
 
         if self.background_color is None:
             self.background_color = self.graphics.create_pen(255, 255, 255)
@@ -43,24 +46,14 @@ class Calendar(ClockMixin):
 
         if rtc is None:
             import machine
-            self.rtc = machine.RTC()
+            rtc = machine.RTC()
+        self.rtc = rtc
 
     def get_day(self):
         _, _, day, _, _, _, _, _ = self.rtc.datetime()
         return day
 
-    def draw_frame(self):
-        with Clip(self.graphics, self.x, self.y, self.width, self.height):
-            self.graphics.set_pen(self.banner_color)
-            self.graphics.rectangle(self.x, self.y, self.width,
-                                    self.banner_height)
-
-            self.graphics.set_pen(self.background_color)
-            self.graphics.rectangle(self.x, self.y + self.banner_height,
-                                    self.width,
-                                    self.height - self.banner_height)
-
-    def draw_day(self, day):
+    def get_day_offset(self, day):
         width = self.graphics.measure_text(day, 1)
 
         # We are trying to center the day
@@ -72,18 +65,88 @@ class Calendar(ClockMixin):
         elif width in (8, 9):
             offset = 1
 
-        self.graphics.set_pen(self.day_color)
-        self.graphics.text(day, self.x + 1 + offset, self.y + 3, -1, 1)
+        return offset
+
+    def load_frame(self, day):
+        """Prepare the frame of the day
+
+        The frame is kept as a list of drawing commands relative to the
+        position: moving the calendar only replays it. It is rebuilt only
+        when the day or the colors change.
+        """
+        key = (day, self.background_color, self.banner_color, self.day_color)
+        if key == self.frame_key:
+            return
+
+        self.frame = (
+            (self.banner_color, 0, 0, self.width, self.banner_height, None),
+            (self.background_color, 0, self.banner_height, self.width,
+             self.height - self.banner_height, None),
+            (self.day_color, 1 + self.get_day_offset(day), 3, 0, 0, day),
+        )
+        self.frame_key = key
+
+    def draw_frame(self):
+        with Clip(self.graphics, self.x, self.y, self.width, self.height):
+            for pen, x, y, width, height, text in self.frame:
+                self.graphics.set_pen(pen)
+                if text is None:
+                    self.graphics.rectangle(self.x + x, self.y + y,
+                                            width, height)
+                else:
+                    self.graphics.text(text, self.x + x, self.y + y, -1, 1)
+
+    # Last rendered state: frame and position
+    last_state = None
+    frame = None
+    frame_key = None
+
+    def full_update(self):
+        """Force the next draw (e.g. after the screen was cleared)"""
+        self.last_state = None
 
     def draw_all(self, day=None):
+        """Draw the calendar
+
+        Nothing is done if the calendar is already displayed, returns
+        True if it was drawn.
+        """
+        self.load_frame(str(day if day else self.get_day()))
+
+        state = (self.frame_key, self.x, self.y)
+        if state == self.last_state:
+            return False
+
         self.draw_frame()
+        self.last_state = state
+        return True
+
+    def get_next_day_delay(self):
+        """Get the number of seconds until the next midnight"""
+        _, _, _, _, hour, minute, second, _ = self.rtc.datetime()
+        return 24 * 3600 - (hour * 3600 + minute * 60 + second)
+
+    # ticks_ms of the next refresh
+    next_refresh = None
 
-        self.draw_day(str(day if day else self.get_day()))
+    def get_deadline(self):
+        return self.next_refresh
+
+    async def refresh(self):
+        self.dirty = False
+
+        if self.draw_all():
+            self.update_display(self.x, self.y, self.width, self.height)
+
+        # One more second to be sure the day changed
+        self.next_refresh = ticks_add(
+            ticks_ms(), (self.get_next_day_delay() + 1) * 1000,
+        )
 
     async def run(self):
         while True:
-            self.draw_all()
-
-            self.galactic.update(self.graphics)
+            await self.refresh()
 
-            await asyncio.sleep(30)
+            await asyncio.sleep_ms(
+                max(0, ticks_diff(self.next_refresh, ticks_ms())),
+            )